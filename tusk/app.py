@@ -1,23 +1,46 @@
 from __future__ import annotations
 
+import difflib
 import os
 import sys
+import time
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Iterator
 
-from textual import events
-from textual.app import App, ComposeResult
+from rich.text import Text
+from textual import events, work
+from textual.app import App, ComposeResult, SystemCommand
 from textual.binding import Binding
-from textual.containers import Horizontal, Vertical
-from textual.screen import ModalScreen
-from textual.widgets import Button, Input, Markdown, Static
+from textual.command import Hit, Hits, Provider
+from textual.containers import Horizontal, Vertical, VerticalScroll
+from textual.geometry import Offset
+from textual.screen import ModalScreen, Screen
+from textual.widgets import Button, Input, OptionList, Static
+from textual.widgets.option_list import Option
+from textual.worker import get_current_worker
 from vim_engine.adapters.textual.widget import VimEditor
 from vim_engine.logging import NetworkLogStreamer
 
-from tusk.utils import AutoSave, CacheManager
-
-DRAFT_DIR = Path.home() / ".tusk" / "drafts"
+from tusk.utils import AutoSave, CacheManager, DraftStore, PreviewMarkdown
+from tusk.utils.changes import ChangeBus, ChangeEvent
+from tusk.utils.drafts import DraftInfo
+from tusk.utils.frontmatter import NoteIndex
+from tusk.utils.governor import GovernorLevel, PerformanceGovernor
+from tusk.utils.history import Snapshot, VersionStore
+from tusk.utils.links import LinkIssue, LinkValidator
+from tusk.utils.logs import setup_logging, shutdown_logging
+from tusk.utils.memory import MemoryMonitor
+from tusk.utils.merge import merge_texts
+from tusk.utils.recorder import SessionRecorder
+from tusk.utils.save import CONFLICT_MESSAGE
+from tusk.utils.session import SessionState, SessionStore, from_json, json_safe
+from tusk.utils.spellcheck import SpellChecker, SpellIssue
+from tusk.utils.stats import WordCounter
+from tusk.utils.watcher import FileWatcher
+
+DATA_DIR = Path.home() / ".tusk"
 
 
 class SaveAsScreen(ModalScreen[Path | None]):
@@ -82,13 +105,322 @@ class SaveAsScreen(ModalScreen[Path | None]):
         self.dismiss(Path(value))
 
 
+class RecentDraftsScreen(ModalScreen[Path | None]):
+    """Modal picker listing recent drafts from the draft index."""
+
+    CSS = """
+    #recent-drafts-modal {
+        padding: 1 2;
+        border: round $accent;
+        width: 70%;
+        max-width: 100;
+        height: auto;
+        max-height: 80%;
+        background: $panel;
+    }
+
+    #recent-drafts-list {
+        height: auto;
+        max-height: 20;
+        margin: 1 0 0 0;
+    }
+    """
+
+    BINDINGS = [Binding("escape", "dismiss_picker", "Close")]
+
+    def __init__(self, drafts: list[DraftInfo]) -> None:
+        super().__init__()
+        self.drafts = drafts
+
+    def compose(self) -> ComposeResult:
+        options = [
+            Option(self._describe(info), id=str(info.path)) for info in self.drafts
+        ]
+        yield Vertical(
+            Static("Recent drafts:", id="recent-drafts-title"),
+            OptionList(*options, id="recent-drafts-list"),
+            id="recent-drafts-modal",
+        )
+
+    def on_mount(self) -> None:
+        self.query_one("#recent-drafts-list", OptionList).focus()
+
+    @staticmethod
+    def _describe(info: DraftInfo) -> str:
+        modified = datetime.fromtimestamp(info.mtime).strftime("%Y-%m-%d %H:%M")
+        title = info.title or "(empty)"
+        return f"{title}  [{modified}, {info.size} bytes]  {info.path.name}"
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        option_id = event.option.id
+        self.dismiss(Path(option_id) if option_id else None)
+
+    def action_dismiss_picker(self) -> None:
+        self.dismiss(None)
+
+
+class ExternalChangeScreen(ModalScreen[str]):
+    """Modal dialog shown when the open file was changed by another program."""
+
+    CSS = """
+    #external-change-modal {
+        padding: 1 2;
+        border: round $warning;
+        width: 60%;
+        max-width: 80;
+        height: auto;
+        background: $panel;
+    }
+
+    #external-change-actions {
+        width: 100%;
+        height: auto;
+        margin: 1 0 0 0;
+        align-horizontal: right;
+    }
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        super().__init__()
+        self.file_path = file_path
+
+    def compose(self) -> ComposeResult:
+        yield Vertical(
+            Static(
+                f"{self.file_path} was changed on disk by another program.\n"
+                "Autosave is paused until you choose how to continue.",
+                id="external-change-title",
+            ),
+            Horizontal(
+                Button("Keep mine", id="keep"),
+                Button("Merge", id="merge"),
+                Button("Reload", id="reload", variant="primary"),
+                id="external-change-actions",
+            ),
+            id="external-change-modal",
+        )
+
+    def on_mount(self) -> None:
+        self.query_one("#reload", Button).focus()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        self.dismiss(event.button.id or "reload")
+
+
+class VersionHistoryScreen(ModalScreen[str | None]):
+    """Timeline of saved versions with a diff against the current text."""
+
+    CSS = """
+    #version-history-modal {
+        padding: 1 2;
+        border: round $accent;
+        width: 90%;
+        height: 85%;
+        background: $panel;
+    }
+
+    #version-history-body {
+        height: 1fr;
+        margin: 1 0 0 0;
+    }
+
+    #version-history-list {
+        width: 42;
+        height: 100%;
+    }
+
+    #version-history-diff-box {
+        width: 1fr;
+        height: 100%;
+        margin: 0 0 0 1;
+    }
+    """
+
+    BINDINGS = [Binding("escape", "dismiss_history", "Close")]
+
+    MAX_DIFF_LINES = 2000
+
+    def __init__(
+        self, store: VersionStore, snapshots: list[Snapshot], current_text: str
+    ) -> None:
+        super().__init__()
+        self.store = store
+        self.snapshots = snapshots
+        self.current_text = current_text
+
+    def compose(self) -> ComposeResult:
+        options = [
+            Option(self._describe(snapshot), id=str(index))
+            for index, snapshot in enumerate(self.snapshots)
+        ]
+        yield Vertical(
+            Static(
+                "Versions (Enter restores, Esc closes):", id="version-history-title"
+            ),
+            Horizontal(
+                OptionList(*options, id="version-history-list"),
+                VerticalScroll(
+                    Static("", id="version-history-diff"),
+                    id="version-history-diff-box",
+                ),
+                id="version-history-body",
+            ),
+            id="version-history-modal",
+        )
+
+    def on_mount(self) -> None:
+        self.query_one("#version-history-list", OptionList).focus()
+
+    @staticmethod
+    def _describe(snapshot: Snapshot) -> str:
+        saved = datetime.fromtimestamp(snapshot.time).strftime("%Y-%m-%d %H:%M:%S")
+        return f"#{snapshot.id}  {saved}  {snapshot.reason}  [{snapshot.size} chars]"
+
+    def _selected(self, option_id: str | None) -> Snapshot | None:
+        if option_id is None:
+            return None
+        return self.snapshots[int(option_id)]
+
+    def on_option_list_option_highlighted(
+        self, event: OptionList.OptionHighlighted
+    ) -> None:
+        snapshot = self._selected(event.option.id)
+        if snapshot is not None:
+            self._show_diff(snapshot)
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        snapshot = self._selected(event.option.id)
+        if snapshot is None:
+            self.dismiss(None)
+            return
+        try:
+            self.dismiss(self.store.load(snapshot))
+        except (OSError, ValueError) as exc:
+            self.notify(f"Cannot load version: {exc}", severity="error")
+
+    @work(thread=True, exclusive=True, group="version-diff")
+    def _show_diff(self, snapshot: Snapshot) -> None:
+        try:
+            old_text = self.store.load(snapshot)
+        except (OSError, ValueError) as exc:
+            diff = Text(f"Cannot load version: {exc}", style="red")
+        else:
+            diff = self._render_diff(old_text, self.current_text)
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self._set_diff, diff)
+
+    def _render_diff(self, old_text: str, new_text: str) -> Text:
+        if old_text == new_text:
+            return Text("Same as the current text.", style="dim")
+        lines = difflib.unified_diff(
+            old_text.splitlines(),
+            new_text.splitlines(),
+            fromfile="version",
+            tofile="current",
+            lineterm="",
+        )
+        diff = Text()
+        for count, line in enumerate(lines):
+            if count >= self.MAX_DIFF_LINES:
+                diff.append("… diff truncated\n", style="dim")
+                break
+            if line.startswith(("+++", "---")):
+                style = "bold"
+            elif line.startswith("@@"):
+                style = "cyan"
+            elif line.startswith("+"):
+                style = "green"
+            elif line.startswith("-"):
+                style = "red"
+            else:
+                style = ""
+            diff.append(line + "\n", style=style)
+        return diff
+
+    def _set_diff(self, diff: Text) -> None:
+        self.query_one("#version-history-diff", Static).update(diff)
+
+    def action_dismiss_history(self) -> None:
+        self.dismiss(None)
+
+
+class MemoryReportScreen(ModalScreen[None]):
+    """Latest memory sample, per-subsystem growth and top allocation sites."""
+
+    CSS = """
+    #memory-modal {
+        padding: 1 2;
+        border: round $accent;
+        width: 90%;
+        height: 85%;
+        background: $panel;
+    }
+
+    #memory-report-box {
+        height: 1fr;
+        margin: 1 0 0 0;
+    }
+    """
+
+    BINDINGS = [Binding("escape", "dismiss_report", "Close")]
+
+    def __init__(self, report: str) -> None:
+        super().__init__()
+        self.report = report
+
+    def compose(self) -> ComposeResult:
+        yield Vertical(
+            Static("Memory diagnostics (Esc closes):", id="memory-title"),
+            VerticalScroll(
+                Static(Text(self.report), id="memory-report"),
+                id="memory-report-box",
+            ),
+            id="memory-modal",
+        )
+
+    def action_dismiss_report(self) -> None:
+        self.dismiss(None)
+
+
+class NoteIndexProvider(Provider):
+    """Command palette source answering front-matter queries.
+
+    Queries containing "#tag" or "field:value" terms are answered from the
+    note index; any other words narrow the results by title or file name.
+    """
+
+    async def search(self, query: str) -> Hits:
+        terms = query.split()
+        if not any(term.startswith("#") or ":" in term for term in terms):
+            return
+        app = self.app
+        if not isinstance(app, Tusk):
+            return
+        for rank, entry in enumerate(app.note_index.query(query)):
+            details = []
+            if entry.tags:
+                details.append("#" + " #".join(entry.tags))
+            status = entry.fields.get("status")
+            if isinstance(status, str) and status:
+                details.append(f"status: {status}")
+            details.append(str(entry.path))
+            yield Hit(
+                1.0 / (rank + 1),
+                f"Open {entry.title}",
+                partial(app._open_document, entry.path),
+                help="  ".join(details),
+            )
+
+
 class Tusk(App):
-    COMMANDS = App.COMMANDS
+    COMMANDS = App.COMMANDS | {NoteIndexProvider}
 
     BINDINGS = [
         Binding("ctrl+p", "command_palette", "Command palette"),
         Binding("ctrl+s", "save", "Save"),
         Binding("ctrl+shift+s", "save_as", "Save As"),
+        Binding("ctrl+o", "recent_drafts", "Recent drafts"),
+        Binding("ctrl+t", "version_history", "Version history"),
         Binding("ctrl+!", "toggle_input", "Toggle Input"),
         Binding("ctrl+@", "toggle_preview", "Toggle Preview"),
         Binding("ctrl+l", "expand_input_box", "Widen input"),
@@ -113,6 +445,7 @@ class Tusk(App):
         height: 104%;
         border: blank;
         color: #F1F1F1;
+        overflow-y: auto;
         scrollbar-size-vertical: 1;
     }
 
@@ -125,6 +458,25 @@ class Tusk(App):
     """
 
     SAVE_INTERVAL = 0.8
+    SPELLCHECK_DELAY = 0.4
+    LINKCHECK_DELAY = 1.0
+    HISTORY_IDLE_DELAY = 30.0
+    NOTE_INDEX_DELAY = 5.0
+    MEMORY_SAMPLE_INTERVAL = 60.0
+    SESSION_SAVE_INTERVAL = 5.0
+    # Subscription schedules per governor level: (delay, debounce).
+    PREVIEW_SCHEDULES = {
+        GovernorLevel.FULL: (None, False),
+        GovernorLevel.THROTTLED: (0.25, False),
+        GovernorLevel.DEFERRED: (0.25, False),
+        GovernorLevel.PAUSED: (1.5, True),
+    }
+    DOCUMENT_SCHEDULES = {
+        GovernorLevel.FULL: (None, False),
+        GovernorLevel.THROTTLED: (None, False),
+        GovernorLevel.DEFERRED: (1.0, False),
+        GovernorLevel.PAUSED: (1.0, False),
+    }
 
     def __init__(
         self,
@@ -134,8 +486,23 @@ class Tusk(App):
         log_stream: bool = False,
         log_host: str = "127.0.0.1",
         log_port: int | None = None,
+        record_session: Path | None = None,
+        log_level: str | None = None,
+        memory_diagnostics: bool = False,
+        data_dir: Path = DATA_DIR,
     ) -> None:
+        # Everything Tusk writes (logs, drafts, history, sessions, index,
+        # settings) lives under data_dir; replays point it at a scratch copy.
+        self.data_dir = data_dir
+        setup_logging(log_level, log_file=data_dir / "logs" / "tusk.log")
+        # Start tracing first so allocations made while building the app count.
+        self.memory_monitor = (
+            MemoryMonitor(dump_dir=data_dir / "logs") if memory_diagnostics else None
+        )
+        if self.memory_monitor:
+            self.memory_monitor.start()
         self._draft_notice: str | None = None
+        self.draft_store = DraftStore(data_dir / "drafts")
         self.file_path = self._prepare_file_path(file_path)
         self.markdown = markdown
         self.show_preview = True
@@ -143,46 +510,99 @@ class Tusk(App):
         self._last_save_state = "never"
         self._last_save_error: str | None = None
         self._editor_text = markdown
-        self._last_preview_text: str | None = None
+        self.change_bus = ChangeBus(self.set_timer, markdown)
+        self.word_counter = WordCounter()
         self._last_word_count = 0
         self._last_char_count = 0
         self._vim_status_text = ""
         self._vim_command_text = ""
         self._vim_editor: VimEditor | None = None
-        self._preview_widget: Markdown | None = None
+        self._preview_widget: PreviewMarkdown | None = None
         self._status_widget: Static | None = None
         self._suppress_vim_callback = False
+        self._change_flush_scheduled = False
+        self._synced_editor_line: int | None = None
 
         self._log_stream_requested = log_stream
         self._log_stream_host = log_host
         self._log_stream_port = log_port
         self._log_streamer: NetworkLogStreamer | None = None
+        self._recorder = SessionRecorder(record_session) if record_session else None
 
         self.auto_save = AutoSave(self.file_path)
+        self.file_watcher = FileWatcher(self.file_path, self._on_file_watch_event)
+        self._external_change_pending = False
+        self.spell_checker = SpellChecker()
+        self._spell_issues: list[SpellIssue] = []
+        self.link_validator = LinkValidator()
+        self._link_issues: list[LinkIssue] = []
+        self.version_store = VersionStore(data_dir / "history")
+        self.note_index = NoteIndex(data_dir / "index" / "frontmatter.json")
+        self.session_store = SessionStore(data_dir / "sessions")
+        self._pending_preview_scroll: float | None = None
+        # Registers and marks as last staged, and what they were built from.
+        self._session_vim_key: tuple | None = None
+        self._session_vim_state: SessionState = {}
+
+        self.governor = PerformanceGovernor()
+        self._preview_subscription = self.change_bus.subscribe(self._on_preview_changes)
+        self._document_subscription = self.change_bus.subscribe(
+            self._on_document_changes
+        )
+        self.change_bus.subscribe(
+            self._on_spellcheck_changes, delay=self.SPELLCHECK_DELAY, debounce=True
+        )
+        self.change_bus.subscribe(
+            self._on_link_changes, delay=self.LINKCHECK_DELAY, debounce=True
+        )
+        self.change_bus.subscribe(
+            self._on_history_changes, delay=self.HISTORY_IDLE_DELAY, debounce=True
+        )
+        self.change_bus.subscribe(
+            self._on_note_index_changes, delay=self.NOTE_INDEX_DELAY, debounce=True
+        )
 
         super().__init__()
 
-        self.cache_manager = CacheManager(self)
+        self.cache_manager = CacheManager(self, data_dir / "cache")
+
+        global_settings = self.cache_manager.load_settings()
+        self.global_settings = global_settings
 
-        # Load settings for this specific file
-        self.settings = self.cache_manager.load_settings(str(self.file_path))
+        self.session = self.session_store.load(self.file_path)
+        self.settings = self._settings_for(self.file_path, self.session)
         self.show_preview = self.settings["show_preview"]
         self.input_width = self.settings["input_width"]
 
+        self.draft_store.retention_days = global_settings["draft_retention_days"]
+        self.draft_store.max_drafts = global_settings["draft_max_count"]
+        self.spellcheck_enabled = bool(global_settings["spellcheck"])
+        self.governor.budget = global_settings["edit_latency_budget_ms"] / 1000
+        self.version_store.max_snapshots = global_settings["history_max_snapshots"]
+        notes_dir = global_settings["notes_dir"]
+        # Without a configured folder nothing is indexed: the open file's
+        # folder may well be $HOME or /tmp.
+        self.notes_root: Path | None = (
+            Path(notes_dir).expanduser() if notes_dir else None
+        )
+
+    def _settings_for(self, path: Path, state: SessionState) -> Dict[str, Any]:
+        """Settings for a file: its session's, over the global settings.
+
+        Only files without saved session settings, i.e. last opened before
+        sessions existed, read their entry from the shared settings file.
+        """
+        saved_settings = state.get("settings")
+        if not isinstance(saved_settings, dict):
+            saved_settings = self.cache_manager.load_file_settings(str(path))
+        return {**self.global_settings, **saved_settings}
+
     def _prepare_file_path(self, file_path: Path | None) -> Path:
         if file_path and file_path != Path():
             file_path.parent.mkdir(parents=True, exist_ok=True)
             return file_path
 
-        draft_dir = DRAFT_DIR
-        draft_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        draft_path = draft_dir / f"draft-{timestamp}.md"
-        counter = 1
-        while draft_path.exists():
-            draft_path = draft_dir / f"draft-{timestamp}-{counter}.md"
-            counter += 1
-        draft_path.touch()
+        draft_path = self.draft_store.create()
         self._draft_notice = f"Working in draft: {draft_path}"
         return draft_path
 
@@ -196,13 +616,15 @@ class Tusk(App):
             on_command_change=self._handle_vim_command,
             on_event=self._handle_vim_event,
         )
-        self._preview_widget = Markdown(self.markdown, id="preview-box")
+        self._preview_widget = PreviewMarkdown(self.markdown, id="preview-box")
         yield Horizontal(self._vim_editor, self._preview_widget)
         initial_status = self._build_status(words=0, chars=0)
         self._status_widget = Static(initial_status, id="status-bar")
         yield self._status_widget
 
     async def on_key(self, event: events.Key) -> None:
+        if self._recorder:
+            self._recorder.record_key(event.key, getattr(event, "character", None))
         target = getattr(event, "target", None)
         target_id = getattr(target, "id", None)
         self._log_state(
@@ -226,21 +648,44 @@ class Tusk(App):
                 initial_content = ""
                 self.notify(f"Error loading file: {exc}", severity="error")
 
-        self._editor_text = initial_content
         if self._preview_widget:
             self._preview_widget.update(initial_content)
         if self._vim_editor:
             buffer_name = str(self.file_path) if self.file_path else "draft"
             self._vim_editor.set_buffer_name(buffer_name)
-            self._suppress_vim_callback = True
-            self._vim_editor.load_text(initial_content)
-            self._suppress_vim_callback = False
+            self.watch(
+                self._vim_editor, "scroll_y", self._sync_preview_scroll, init=False
+            )
+        self._load_editor_text(initial_content)
+        self._apply_settings(self.settings)
+        self._restore_session(self.session)
 
         self._on_editor_text_changed(initial_content, initial_load=True)
+        self._snapshot_version("open")
+        self.file_watcher.start()
+
+        if self._recorder:
+            try:
+                self._recorder.start(initial_content, str(self.file_path))
+            except OSError as exc:
+                self._recorder = None
+                self.notify(f"Cannot record session: {exc}", severity="error")
 
         if self._draft_notice:
             self.notify(self._draft_notice, severity="information")
 
+        removed = self.draft_store.collect_garbage(keep=self.file_path)
+        if removed:
+            self._log_line(f"draft gc removed {removed} draft(s)")
+        self._collect_history_garbage()
+        if self.notes_root:
+            self._index_notes(self.notes_root)
+        self._collect_session_garbage()
+        self.set_interval(self.SESSION_SAVE_INTERVAL, self._save_session)
+        if self.memory_monitor:
+            self._sample_memory()
+            self.set_interval(self.MEMORY_SAMPLE_INTERVAL, self._sample_memory)
+
         if self._log_stream_requested:
             await self._start_log_stream()
 
@@ -248,9 +693,15 @@ class Tusk(App):
         """Save content directly to the opened file."""
         success, error = self.auto_save.autosave_content(self._editor_text)
         self._record_save_result(success, error)
+        if success and self.file_path:
+            self.draft_store.record(self.file_path, self._editor_text)
+            self._update_note_index()
+            self._snapshot_version("save")
         self._refresh_status_from_input()
         if success:
             self.notify("File saved", severity="information")
+        elif error == CONFLICT_MESSAGE:
+            self._check_external_change()
         else:
             self.notify(error or "Failed to save file", severity="error")
 
@@ -272,6 +723,7 @@ class Tusk(App):
         if not target.is_absolute():
             target = Path.cwd() / target
 
+        self._flush_pending_edits()
         content = self._editor_text
         previous_path = self.file_path
 
@@ -285,11 +737,11 @@ class Tusk(App):
                 and previous_path != target
                 and self._is_draft_path(previous_path)
             ):
-                try:
-                    previous_path.unlink()
-                except OSError:
-                    pass
+                self.draft_store.remove(previous_path)
+                self.draft_store.flush()
             self._draft_notice = None
+            self.file_watcher.set_path(target)
+            self._snapshot_version("save")
             self._record_save_result(True, None)
             self.notify(f"Saved to {target}", severity="information")
             self._refresh_status_from_input()
@@ -301,6 +753,379 @@ class Tusk(App):
             self._refresh_status_from_input()
             self.notify(error or "Save As failed", severity="error")
 
+    def action_recent_drafts(self) -> None:
+        """Show a picker of recent drafts read from the draft index."""
+        drafts = [
+            info for info in self.draft_store.recent() if info.path != self.file_path
+        ]
+        if not drafts:
+            self.notify("No other drafts", severity="information")
+            return
+        self.push_screen(RecentDraftsScreen(drafts), self._recent_draft_result)
+
+    def _recent_draft_result(self, draft_path: Path | None) -> None:
+        if draft_path:
+            self._open_document(draft_path)
+
+    def _open_document(self, path: Path) -> None:
+        """Switch the editor to another file, keeping the current one saved."""
+        if not path.is_file():
+            if self._is_draft_path(path):
+                self.draft_store.remove(path)
+            self.notify(f"{path} no longer exists", severity="warning")
+            return
+
+        # Read before switching anything: if the read fails, the editor must
+        # stay bound to the file its text came from.
+        auto_save = AutoSave(path)
+        try:
+            content = auto_save.load_last_save()
+        except Exception as exc:
+            self.notify(f"Error loading file: {exc}", severity="error")
+            return
+
+        self._flush_pending_edits()
+        self.draft_store.flush()
+        self._capture_session()
+        self.file_path = path
+        self.auto_save = auto_save
+
+        if self._vim_editor:
+            self._vim_editor.set_buffer_name(str(path))
+        self._load_editor_text(content)
+        state = self.session_store.load(path)
+        self._apply_settings(self._settings_for(path, state))
+        self._restore_session(state)
+        self._draft_notice = None
+        self.file_watcher.set_path(path)
+        self._on_editor_text_changed(content, initial_load=True)
+        self._snapshot_version("open")
+        self.notify(f"Opened {path}", severity="information")
+
+    def _capture_session(self) -> None:
+        """Stage the open file's cursor, scroll and vim state for saving."""
+        if not self.file_path:
+            return
+        state: SessionState = {
+            "settings": {
+                "theme": self.theme,
+                "input_width": self.input_width,
+                "show_preview": self.show_preview,
+            }
+        }
+        editor = self._vim_editor
+        if editor:
+            cursor = getattr(editor, "cursor_location", None)
+            if cursor is not None:
+                state["cursor"] = list(cursor)
+            state["scroll"] = [editor.scroll_offset.x, editor.scroll_offset.y]
+            folds = json_safe(getattr(editor, "folds", None))
+            if folds is not None:
+                state["folds"] = folds
+            state.update(self._capture_vim_state(editor))
+        if self._preview_widget:
+            state["preview_scroll"] = self._preview_widget.scroll_offset.y
+        self.session_store.update(self.file_path, state)
+
+    def _capture_vim_state(self, editor: VimEditor) -> SessionState:
+        """Registers and marks, converted only when they may have changed.
+
+        Yanks and mark updates replace entries rather than mutating them,
+        so entry identities plus the document version are a cheap stand-in
+        for a deep comparison.
+        """
+        manager = getattr(editor, "manager", None)
+        values = {}
+        key: list = [self.file_path, self.change_bus.version]
+        for name in ("registers", "marks"):
+            value = getattr(manager, name, None)
+            if isinstance(value, dict):
+                values[name] = value
+                key.append(tuple((item, id(entry)) for item, entry in value.items()))
+        if tuple(key) != self._session_vim_key:
+            self._session_vim_key = tuple(key)
+            self._session_vim_state = {
+                name: json_safe(value) for name, value in values.items()
+            }
+        return self._session_vim_state
+
+    def _save_session(self) -> None:
+        self._capture_session()
+        if self.session_store.pending:
+            self._flush_sessions()
+
+    @work(thread=True, exclusive=True, group="session")
+    def _flush_sessions(self) -> None:
+        self.session_store.flush()
+
+    @work(thread=True, group="session")
+    def _collect_session_garbage(self) -> None:
+        removed = self.session_store.collect_garbage()
+        if removed:
+            self.call_from_thread(
+                self._log_line, f"session gc removed {removed} session(s)"
+            )
+
+    def _restore_session(self, state: SessionState) -> None:
+        """Put back vim state now and the cursor and scroll after layout."""
+        editor = self._vim_editor
+        if not state or not editor:
+            return
+        manager = getattr(editor, "manager", None)
+        for name in ("registers", "marks"):
+            saved = state.get(name)
+            current = getattr(manager, name, None)
+            if isinstance(saved, dict) and isinstance(current, dict):
+                current.update(from_json(saved))
+        if "folds" in state and hasattr(editor, "folds"):
+            try:
+                editor.folds = from_json(state["folds"])
+            except (AttributeError, TypeError, ValueError):
+                pass
+        self._pending_preview_scroll = state.get("preview_scroll")
+        self.call_after_refresh(self._restore_view, state)
+
+    def _apply_settings(self, settings: Dict[str, Any]) -> None:
+        """Adopt a file's theme and pane layout."""
+        self.settings = settings
+        self.show_preview = settings["show_preview"]
+        self.input_width = settings["input_width"]
+        if settings.get("theme") in self.available_themes:
+            self.theme = settings["theme"]
+        self._apply_layout()
+
+    def _apply_layout(self) -> None:
+        """Size the editor and preview panes from show_preview and input_width."""
+        input_box = self._vim_editor
+        preview = self._preview_widget
+        if not input_box or not preview:
+            return
+        if self.show_preview:
+            input_box.styles.width = f"{self.input_width}%"
+            preview.styles.width = f"{100 - self.input_width}%"
+        else:
+            input_box.styles.width = "100%"
+            preview.styles.width = "0%"
+
+    def _restore_view(self, state: SessionState) -> None:
+        editor = self._vim_editor
+        if not editor:
+            return
+        cursor = state.get("cursor")
+        if cursor and hasattr(editor, "cursor_location"):
+            lines = self._editor_text.split("\n")
+            row = max(0, min(int(cursor[0]), len(lines) - 1))
+            column = max(0, min(int(cursor[1]), len(lines[row])))
+            try:
+                editor.cursor_location = (row, column)
+            except (AttributeError, TypeError, ValueError):
+                pass
+        scroll = state.get("scroll")
+        if scroll:
+            editor.scroll_to(scroll[0], scroll[1], animate=False, immediate=True)
+
+    def action_version_history(self) -> None:
+        """Browse saved versions of the open file and restore one."""
+        if not self.file_path:
+            return
+        snapshots = self.version_store.snapshots(self.file_path)
+        if not snapshots:
+            self.notify("No saved versions yet", severity="information")
+            return
+        self.push_screen(
+            VersionHistoryScreen(self.version_store, snapshots, self._editor_text),
+            self._version_history_result,
+        )
+
+    def _version_history_result(self, text: str | None) -> None:
+        if text is None or text == self._editor_text:
+            return
+        self._snapshot_version("before restore")
+        self._load_editor_text(text)
+        self._on_editor_text_changed(text)
+        self.notify("Restored version", severity="information")
+
+    def _snapshot_version(self, reason: str) -> None:
+        """Record the current text in the version store off the UI thread."""
+        if self.file_path:
+            self._store_version(self.file_path, self._editor_text, reason)
+
+    @work(thread=True, group="history")
+    def _store_version(self, path: Path, text: str, reason: str) -> None:
+        try:
+            self.version_store.snapshot(path, text, reason)
+        except OSError as exc:
+            self.call_from_thread(
+                self.notify, f"Cannot save version: {exc}", severity="warning"
+            )
+
+    @work(thread=True, group="history")
+    def _collect_history_garbage(self) -> None:
+        try:
+            removed = self.version_store.collect_garbage()
+        except OSError:
+            return
+        if removed:
+            self.call_from_thread(
+                self._log_line, f"history gc removed {removed} chunk(s)"
+            )
+
+    @work(thread=True, exclusive=True, group="note-index")
+    def _index_notes(self, root: Path) -> None:
+        """Bring the front-matter index up to date for notes under root."""
+        updated = self.note_index.scan(root)
+        self.note_index.flush()
+        if updated:
+            self.call_from_thread(
+                self._log_line, f"note index refreshed {updated} file(s)"
+            )
+
+    def _on_note_index_changes(self, events: list[ChangeEvent]) -> None:
+        """Re-read the open note's front matter once editing pauses."""
+        if not all(event.reset for event in events):
+            self._update_note_index()
+
+    def _update_note_index(self) -> None:
+        """Index the saved text of the open file if it lives under notes_root."""
+        if not self.notes_root or not self.file_path:
+            return
+        try:
+            if not self.file_path.resolve().is_relative_to(self.notes_root.resolve()):
+                return
+        except OSError:
+            return
+        self.note_index.update(self.file_path, self.auto_save.base_content)
+
+    def _memory_probes(self) -> Dict[str, int]:
+        """Sizes of the app's own buffers and caches, read on the UI thread."""
+        probes = {
+            "editor text chars": len(self._editor_text),
+            "saved text chars": len(self.auto_save.base_content),
+            "widgets": len(self.query("*")),
+            "spell cache lines": self.spell_checker.cached_lines,
+            "link check targets": self.link_validator.cached_targets,
+            "note index files": len(self.note_index),
+        }
+        preview = self._preview_widget
+        if preview:
+            probes["preview source chars"] = len(preview.source)
+            probes["preview blocks"] = len(preview.children)
+            probes["highlight cache entries"] = len(preview.highlight_cache)
+            probes["table cell cache entries"] = len(preview.table_cell_cache)
+        return probes
+
+    def _sample_memory(self) -> None:
+        if self.memory_monitor:
+            self._take_memory_sample(self._memory_probes())
+
+    @work(thread=True, exclusive=True, group="memory")
+    def _take_memory_sample(self, probes: Dict[str, int]) -> None:
+        if self.memory_monitor:
+            self.memory_monitor.sample(probes)
+
+    def get_system_commands(self, screen: Screen) -> Iterator[SystemCommand]:
+        yield from super().get_system_commands(screen)
+        if self.memory_monitor:
+            yield SystemCommand(
+                "Memory diagnostics",
+                "Show memory use per subsystem and its growth",
+                self.action_memory_report,
+            )
+            yield SystemCommand(
+                "Dump memory report",
+                "Write every memory sample to ~/.tusk/logs",
+                self.action_dump_memory,
+            )
+
+    def action_memory_report(self) -> None:
+        """Show the latest memory sample, taking one if none exists yet."""
+        if not self.memory_monitor:
+            self.notify(
+                "Start Tusk with --memory-diagnostics to enable", severity="warning"
+            )
+            return
+        if not self.memory_monitor.samples:
+            self.memory_monitor.sample(self._memory_probes())
+        self.push_screen(MemoryReportScreen(self.memory_monitor.report()))
+
+    @work(thread=True, group="memory")
+    def action_dump_memory(self) -> None:
+        if not self.memory_monitor:
+            return
+        try:
+            path = self.memory_monitor.dump()
+        except OSError as exc:
+            self.call_from_thread(
+                self.notify, f"Cannot write memory report: {exc}", severity="error"
+            )
+            return
+        self.call_from_thread(
+            self.notify, f"Memory report written to {path}", severity="information"
+        )
+
+    def _on_history_changes(self, events: list[ChangeEvent]) -> None:
+        """Snapshot the document once editing pauses."""
+        if not all(event.reset for event in events):
+            self._snapshot_version("idle")
+
+    def _load_editor_text(self, content: str) -> None:
+        """Replace the editor buffer without triggering change callbacks."""
+        self._editor_text = content
+        if self._vim_editor:
+            self._suppress_vim_callback = True
+            self._vim_editor.load_text(content)
+            self._suppress_vim_callback = False
+
+    def _on_file_watch_event(self) -> None:
+        """Called from the watcher thread when the open file may have changed."""
+        try:
+            self.call_from_thread(self._check_external_change)
+        except RuntimeError:
+            pass
+
+    def _check_external_change(self) -> None:
+        if self._external_change_pending or not self.file_path:
+            return
+        if not self.auto_save.check_external_change():
+            return
+        self._external_change_pending = True
+        self._log_state("external-change")
+        self.push_screen(
+            ExternalChangeScreen(self.file_path), self._external_change_result
+        )
+
+    def _external_change_result(self, choice: str | None) -> None:
+        self._external_change_pending = False
+        if choice == "keep":
+            success, error = self.auto_save.autosave_content(
+                self._editor_text, force=True
+            )
+            self._record_save_result(success, error)
+            self._refresh_status_from_input()
+            return
+
+        base = self.auto_save.base_content
+        try:
+            disk_content = self.auto_save.load_last_save()
+        except Exception as exc:
+            self.notify(f"Error loading file: {exc}", severity="error")
+            return
+
+        if choice == "merge":
+            merged, conflicts = merge_texts(base, self._editor_text, disk_content)
+            self._load_editor_text(merged)
+            self._on_editor_text_changed(merged)
+            if conflicts:
+                self.notify("Merged with conflicts; see markers", severity="warning")
+            else:
+                self.notify("Merged changes from disk", severity="information")
+        else:
+            self._snapshot_version("before reload")
+            self._load_editor_text(disk_content)
+            self._on_editor_text_changed(disk_content, initial_load=True)
+            self._snapshot_version("reload")
+            self.notify("Reloaded from disk", severity="information")
+
     def action_toggle_input(self) -> None:
         """Toggle the visibility of the input pane.
 
@@ -333,12 +1158,7 @@ class Tusk(App):
             return
 
         self.show_preview = not self.show_preview
-        if self.show_preview:
-            preview.styles.width = f"{100 - self.input_width}%"
-            input_box.styles.width = f"{self.input_width}%"
-        else:
-            preview.styles.width = "0%"
-            input_box.styles.width = "100%"
+        self._apply_layout()
 
         self._refresh_preview()
 
@@ -381,7 +1201,25 @@ class Tusk(App):
         self._editor_text = text
         if self._suppress_vim_callback:
             return
-        self._on_editor_text_changed(text)
+        # A paste, macro or large undo can make the engine report many changes
+        # while handling one key; process them once, after the key is handled.
+        if not self._change_flush_scheduled:
+            self._change_flush_scheduled = True
+            self.call_later(self._flush_editor_change)
+
+    def _flush_editor_change(self) -> None:
+        self._change_flush_scheduled = False
+        self._on_editor_text_changed(self._editor_text)
+
+    def _flush_pending_edits(self) -> None:
+        """Publish and autosave edits the governor is still holding back.
+
+        Called before the open file is left (exit, switching notes, Save As),
+        since a deferred autosave would otherwise never run for it.
+        """
+        if self._change_flush_scheduled:
+            self._flush_editor_change()
+        self.change_bus.flush(self._document_subscription)
 
     def _handle_vim_status(self, status: str) -> None:
         self._vim_status_text = status
@@ -398,29 +1236,187 @@ class Tusk(App):
             self._update_status_bar(self._last_word_count, self._last_char_count)
 
     def _on_editor_text_changed(self, text: str, *, initial_load: bool = False) -> None:
-        if self._last_preview_text == text and not initial_load:
+        """Publish new editor text to the change bus.
+
+        A load replaces the whole document; anything else is published as a
+        delta and dropped if the text did not actually change.
+        """
+        if initial_load:
+            self.change_bus.reset(text)
             return
-        self._last_preview_text = text
+        started = time.perf_counter()
+        self.change_bus.publish(text)
+        self._apply_governor_level(
+            self.governor.record_edit(time.perf_counter() - started)
+        )
+
+    def _apply_governor_level(self, level: GovernorLevel | None) -> None:
+        """Reschedule pipeline stages after the governor changed level."""
+        if level is None:
+            return
+        delay, debounce = self.PREVIEW_SCHEDULES[level]
+        self.change_bus.reschedule(
+            self._preview_subscription, delay=delay, debounce=debounce
+        )
+        delay, debounce = self.DOCUMENT_SCHEDULES[level]
+        self.change_bus.reschedule(
+            self._document_subscription, delay=delay, debounce=debounce
+        )
+        self._log_state("governor", level=self.governor.label)
+        self._refresh_status_from_input()
+
+    def _on_preview_changes(self, events: list[ChangeEvent]) -> None:
         if self._preview_widget:
-            self._preview_widget.update(text)
+            self._preview_widget.update(events[-1].text)
+
+    def _on_document_changes(self, events: list[ChangeEvent]) -> None:
+        """Autosave, update counts and refresh the status bar."""
+        started = time.perf_counter()
+        self._update_document(events)
+        self._apply_governor_level(
+            self.governor.record_stage("document", time.perf_counter() - started)
+        )
+
+    def _update_document(self, events: list[ChangeEvent]) -> None:
+        for event in events:
+            self.word_counter.apply(event)
+        text = events[-1].text
+        initial_load = events[-1].reset
         previous_state = self._last_save_state
         if initial_load:
             success, error = True, None
         else:
             success, error = self.auto_save.autosave_content(text)
         self._record_save_result(success, error)
+        if success and not initial_load and self.file_path:
+            self.draft_store.record(self.file_path, text)
         if not initial_load:
-            if not success and error and previous_state != "error":
+            if error == CONFLICT_MESSAGE:
+                self._check_external_change()
+            elif not success and error and previous_state != "error":
                 self.notify(error, severity="error")
             elif success and previous_state == "error":
                 self.notify("Autosave restored", severity="information")
-        words = len(text.split())
-        chars = len(text)
+        words = self.word_counter.words
+        chars = self.word_counter.chars
         self._last_word_count = words
         self._last_char_count = chars
         self._update_status_bar(words, chars)
         self._log_state("text", words=words, chars=chars)
 
+    def _on_spellcheck_changes(self, events: list[ChangeEvent]) -> None:
+        """Re-run the spell checker once typing pauses."""
+        if self.spellcheck_enabled:
+            self._run_spellcheck(events[-1].text, events[-1].version)
+
+    @work(thread=True, exclusive=True, group="spellcheck")
+    def _run_spellcheck(self, text: str, version: int) -> None:
+        self.spell_checker.load()
+        issues = self.spell_checker.check(text)
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._apply_spell_issues, version, issues)
+
+    def _apply_spell_issues(self, version: int, issues: list[SpellIssue]) -> None:
+        # Thread workers are not interrupted when superseded, so an older
+        # pass can finish after a newer one; only the latest text counts.
+        if version != self.change_bus.version:
+            return
+        self._spell_issues = issues
+        self._set_editor_underlines(
+            "spelling", [(issue.row, issue.start, issue.end) for issue in issues]
+        )
+        self._update_status_bar(self._last_word_count, self._last_char_count)
+
+    def _set_editor_underlines(
+        self, name: str, ranges: list[tuple[int, int, int]]
+    ) -> None:
+        """Underline (row, start, end) ranges in the editor under a named layer.
+
+        This needs a set_underlines(name, ranges) hook on the editor widget,
+        which the vim engine may not provide; without it, problems are only
+        counted in the status bar.
+        """
+        editor = self._vim_editor
+        if editor is not None and hasattr(editor, "set_underlines"):
+            editor.set_underlines(name, ranges)
+
+    def _on_link_changes(self, events: list[ChangeEvent]) -> None:
+        """Re-check local links and images once typing pauses."""
+        if self.file_path:
+            self._run_link_check(
+                events[-1].text, events[-1].version, self.file_path.parent
+            )
+
+    @work(thread=True, exclusive=True, group="links")
+    def _run_link_check(self, text: str, version: int, base_dir: Path) -> None:
+        issues = self.link_validator.check(text, base_dir)
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._apply_link_issues, version, issues)
+
+    def _apply_link_issues(self, version: int, issues: list[LinkIssue]) -> None:
+        if version != self.change_bus.version:
+            return
+        if not issues and not self._link_issues:
+            return
+        self._link_issues = issues
+        problems: Dict[int, list[str]] = {}
+        for issue in issues:
+            problems.setdefault(issue.row, []).append(
+                f"{issue.problem}: {issue.target}"
+            )
+        if self._preview_widget:
+            self._preview_widget.set_link_problems(problems)
+        self._set_editor_underlines(
+            "links", [(issue.row, issue.start, issue.end) for issue in issues]
+        )
+        self._update_status_bar(self._last_word_count, self._last_char_count)
+
+    def on_markdown_table_of_contents_updated(
+        self, _: PreviewMarkdown.TableOfContentsUpdated
+    ) -> None:
+        # Blocks were remounted, so positions in the preview may have moved.
+        self._synced_editor_line = None
+        if self._preview_widget:
+            self._apply_governor_level(
+                self.governor.record_stage(
+                    "preview", self._preview_widget.last_mount_time
+                )
+            )
+        self._sync_preview_scroll()
+        if self._pending_preview_scroll is not None and self._preview_widget:
+            # The first render after opening a file returns to where the
+            # preview was left, which may differ from the synced position.
+            self._preview_widget.scroll_to(
+                y=self._pending_preview_scroll, animate=False, immediate=True
+            )
+            self._pending_preview_scroll = None
+
+    def _sync_preview_scroll(self) -> None:
+        """Align the preview with the first visible editor line."""
+        if not self._vim_editor or not self._preview_widget or not self.show_preview:
+            return
+        line = self._editor_line_at_row(int(self._vim_editor.scroll_offset.y))
+        if line == self._synced_editor_line:
+            return
+        self._synced_editor_line = line
+        self._preview_widget.scroll_to_source_line(line)
+
+    def _editor_line_at_row(self, row: int) -> int:
+        """Map a visual editor row to a document line.
+
+        With soft wrap on, one long line spans many rows; the editor's
+        wrapped document already knows where it broke each line, at word
+        boundaries, and maps a row back in constant time.
+        """
+        editor = self._vim_editor
+        wrapped = getattr(editor, "wrapped_document", None)
+        if not editor or not getattr(editor, "soft_wrap", False) or not wrapped:
+            return row
+        try:
+            return wrapped.offset_to_location(Offset(0, row))[0]
+        except ValueError:
+            return row
+
     def _log_line(self, message: str) -> None:
         if self._log_streamer:
             self._log_streamer.log(message)
@@ -432,11 +1428,10 @@ class Tusk(App):
             "preview": self.show_preview,
             "theme": self.theme,
         }
-        text = self._editor_text or ""
         data.update(
             {
-                "words": len(text.split()),
-                "chars": len(text),
+                "words": self._last_word_count,
+                "chars": self._last_char_count,
             }
         )
         if (
@@ -476,6 +1471,12 @@ class Tusk(App):
             f"--autosave-enabled-- "
             f"{self.file_path}"
         )
+        if self._spell_issues:
+            status += f" --spelling {len(self._spell_issues)}--"
+        if self._link_issues:
+            status += f" --broken-links {len(self._link_issues)}--"
+        if self.governor.level != GovernorLevel.FULL:
+            status += f" --perf {self.governor.label}--"
         if (
             self._vim_editor
             and self._vim_editor.manager
@@ -493,9 +1494,6 @@ class Tusk(App):
             self._status_widget.update(self._build_status(words, chars))
 
     def _refresh_status_from_input(self) -> None:
-        text = self._editor_text
-        self._last_word_count = len(text.split())
-        self._last_char_count = len(text)
         self._update_status_bar(self._last_word_count, self._last_char_count)
 
     def _record_save_result(self, success: bool, error: str | None) -> None:
@@ -515,27 +1513,33 @@ class Tusk(App):
         return "never"
 
     def _is_draft_path(self, path: Path) -> bool:
-        try:
-            return path.is_relative_to(DRAFT_DIR)
-        except ValueError:
-            return False
+        return self.draft_store.contains(path)
 
     async def on_unmount(self) -> None:
         """Save settings and stop background helpers when the application closes."""
+        self._flush_pending_edits()
         if self.file_path:
+            if self._is_draft_path(self.file_path) and not self._editor_text.strip():
+                self.draft_store.remove(self.file_path)
+                self.session_store.remove(self.file_path)
+            else:
+                self._capture_session()
+        self.session_store.flush()
+        self.draft_store.flush()
+        self._update_note_index()
+        self.note_index.flush()
+        self.file_watcher.stop()
+        if self.memory_monitor:
             try:
-                # Save basic settings only
-                settings = {
-                    "theme": self.theme,
-                    "input_width": self.input_width,
-                    "show_preview": self.show_preview,
-                }
-                self.cache_manager.save_settings(str(self.file_path), settings)
-
-            except Exception as e:
-                print(f"Error saving settings on exit: {e}")
+                self.memory_monitor.dump()
+            except OSError as exc:
+                print(f"Error writing memory report on exit: {exc}")
+            self.memory_monitor.stop()
+        if self._recorder:
+            self._recorder.close()
 
         await self._stop_log_stream()
+        shutdown_logging()
 
 
 if __name__ == "__main__":
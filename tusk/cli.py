@@ -3,8 +3,6 @@ import os
 import sys
 from pathlib import Path
 
-from tusk.app import Tusk
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -31,9 +29,43 @@ def main():
         default=int(os.environ.get("TUSK_LOG_PORT", "8765")),
         help="Port for the log stream (use 0 for ephemeral)",
     )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        type=str.upper,
+        default=None,
+        help="Level for ~/.tusk/logs/tusk.log (default: $TUSK_LOG_LEVEL or INFO)",
+    )
+    parser.add_argument(
+        "--record-session",
+        metavar="PATH",
+        help="Record key events to PATH for replay with tusk-replay",
+    )
+    parser.add_argument(
+        "--memory-diagnostics",
+        action="store_true",
+        help="Trace memory per subsystem; view it from the command palette",
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a warm Tusk daemon that later tusk commands reuse",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Start in this process even if a daemon is running",
+    )
 
     args = parser.parse_args()
 
+    if args.daemon:
+        from tusk.daemon import serve
+
+        serve()
+        return
+
     if args.new and not args.file:
         print("Error: --new requires a filename")
         sys.exit(1)
@@ -57,11 +89,34 @@ def main():
                 sys.exit(1)
 
     log_port = args.log_port if args.log_stream else None
+
+    if not args.no_daemon:
+        from tusk.daemon import run_client
+
+        exit_code = run_client(
+            {
+                "file": str(file_path) if file_path else None,
+                "log_stream": args.log_stream,
+                "log_host": args.log_host,
+                "log_port": log_port,
+                "record_session": args.record_session,
+                "log_level": args.log_level,
+                "memory_diagnostics": args.memory_diagnostics,
+            }
+        )
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from tusk.app import Tusk
+
     app = Tusk(
         file_path=file_path,
         log_stream=args.log_stream,
         log_host=args.log_host,
         log_port=log_port,
+        record_session=Path(args.record_session) if args.record_session else None,
+        log_level=args.log_level,
+        memory_diagnostics=args.memory_diagnostics,
     )
     app.run()
 
@@ -0,0 +1,249 @@
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+    import termios
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+    termios = None  # type: ignore[assignment]
+
+SOCKET_PATH = Path.home() / ".tusk" / "run" / "tusk.sock"
+MAX_MESSAGE = 1024 * 1024
+REQUEST_TIMEOUT = 5.0
+FORWARDED_SIGNALS = ("SIGWINCH", "SIGINT", "SIGTERM", "SIGHUP")
+
+
+def _send(conn: socket.socket, message: Dict[str, Any]) -> None:
+    try:
+        conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+    except OSError:
+        pass
+
+
+def run_client(
+    request: Dict[str, Any], socket_path: Path = SOCKET_PATH
+) -> Optional[int]:
+    """Open a session in a running daemon.
+
+    Hands this process's terminal descriptors to the daemon, then waits for
+    the session's exit code while forwarding resize, interrupt and
+    termination signals. Only the standard library is needed, so the
+    client starts quickly.
+
+    Returns:
+        The session's exit code, or None if no daemon could be used and the
+        caller should start Tusk in-process.
+    """
+    if termios is None or not hasattr(socket, "send_fds") or not sys.stdin.isatty():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+        payload = json.dumps({**request, "cwd": os.getcwd(), "env": dict(os.environ)})
+        socket.send_fds(sock, [payload.encode("utf-8") + b"\n"], [0, 1, 2])
+    except OSError:
+        sock.close()
+        return None
+
+    child_pid: Optional[int] = None
+
+    def forward(signum: int, _frame: object) -> None:
+        if child_pid:
+            try:
+                os.kill(child_pid, signum)
+            except OSError:
+                pass
+
+    for name in FORWARDED_SIGNALS:
+        signal.signal(getattr(signal, name), forward)
+
+    with sock, sock.makefile("r", encoding="utf-8") as reader:
+        for line in reader:
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "pid" in message:
+                child_pid = int(message["pid"])
+            elif "exit" in message:
+                return int(message["exit"])
+            elif "error" in message:
+                print(f"Error: {message['error']}")
+                return 1
+    # The daemon went away without reporting an exit code.
+    return 1
+
+
+def _warm_up() -> None:
+    """Import and exercise the slow parts of startup once."""
+    import tusk.app  # noqa: F401  (Textual, vim engine, Tusk widgets)
+    from markdown_it import MarkdownIt
+    from textual.highlight import highlight
+
+    MarkdownIt("gfm-like").parse("# warm\n\n```python\nx = 1\n```\n")
+    highlight("x = 1", language="python")
+
+
+def _peer_uid(conn: socket.socket) -> Optional[int]:
+    if not hasattr(socket, "SO_PEERCRED"):
+        return os.getuid()
+    creds = conn.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid
+
+
+def _reap_children(_signum: int, _frame: object) -> None:
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def _receive_request(conn: socket.socket) -> Optional[tuple]:
+    """Read a client's request and terminal descriptors.
+
+    Runs in the forked child with a timeout, so a client that connects and
+    stalls cannot hold up other launches. Returns (request, fds), or None
+    after reporting the problem to the client.
+    """
+    conn.settimeout(REQUEST_TIMEOUT)
+    fds: list = []
+    try:
+        data, fds, _, _ = socket.recv_fds(conn, MAX_MESSAGE, 3)
+        while data and not data.endswith(b"\n"):
+            chunk = conn.recv(MAX_MESSAGE)
+            if not chunk:
+                break
+            data += chunk
+        request = json.loads(data.decode("utf-8"))
+    except (OSError, ValueError) as exc:
+        for fd in fds:
+            os.close(fd)
+        _send(conn, {"error": f"bad request: {exc}"})
+        return None
+    if len(fds) != 3:
+        for fd in fds:
+            os.close(fd)
+        _send(conn, {"error": "terminal descriptors missing"})
+        return None
+    conn.settimeout(None)
+    return request, fds
+
+
+def _run_session(conn: socket.socket, request: Dict[str, Any], fds: list) -> None:
+    """Child side of a fork: adopt the client's terminal and run Tusk."""
+    code = 1
+    try:
+        os.setsid()
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            if fd > 2:
+                os.close(fd)
+        try:
+            # Take the terminal as this session's controlling tty so the
+            # kernel delivers its signals here. It refuses (EPERM) while the
+            # terminal still belongs to the client's session; the session
+            # then runs without one and relies on the client forwarding
+            # resize, interrupt and hangup signals.
+            fcntl.ioctl(0, termios.TIOCSCTTY, 0)
+        except OSError:
+            pass
+        os.environ.clear()
+        os.environ.update(request.get("env", {}))
+        os.chdir(request.get("cwd") or "/")
+        _send(conn, {"pid": os.getpid()})
+
+        from tusk.app import Tusk
+
+        file_arg = request.get("file")
+        record = request.get("record_session")
+        app = Tusk(
+            file_path=Path(file_arg) if file_arg else None,
+            log_stream=bool(request.get("log_stream")),
+            log_host=request.get("log_host", "127.0.0.1"),
+            log_port=request.get("log_port"),
+            record_session=Path(record) if record else None,
+            log_level=request.get("log_level"),
+            memory_diagnostics=bool(request.get("memory_diagnostics")),
+        )
+        app.run()
+        code = app.return_code or 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        _send(conn, {"exit": code})
+        os._exit(code)
+
+
+def serve(socket_path: Path = SOCKET_PATH) -> None:
+    """Run the daemon in the foreground until interrupted.
+
+    Textual, the vim engine and Tusk are imported once; each connection
+    forks a child that reads the request, adopts the client's terminal
+    descriptors and runs a fresh Tusk session, so opening a note skips
+    interpreter and import startup.
+    """
+    if termios is None or not hasattr(os, "fork"):
+        print("The Tusk daemon is not supported on this platform")
+        sys.exit(1)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    os.chmod(socket_path.parent, 0o700)
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except OSError:
+        socket_path.unlink(missing_ok=True)
+    else:
+        print(f"Tusk daemon already running on {socket_path}")
+        sys.exit(1)
+    finally:
+        probe.close()
+
+    _warm_up()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    os.chmod(socket_path, 0o600)
+    server.listen(16)
+    signal.signal(signal.SIGCHLD, _reap_children)
+    print(f"Tusk daemon listening on {socket_path}")
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except InterruptedError:
+                continue
+            with conn:
+                if _peer_uid(conn) != os.getuid():
+                    continue
+                # Read the request in the child: a client that connects and
+                # stalls only holds up its own fork.
+                if os.fork() == 0:
+                    try:
+                        server.close()
+                        received = _receive_request(conn)
+                        if received is not None:
+                            _run_session(conn, *received)
+                    finally:
+                        os._exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        socket_path.unlink(missing_ok=True)
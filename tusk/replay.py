@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from tusk.utils.recorder import RecordedSession, latency_summary, load_session
+
+
+async def replay_session(
+    session: RecordedSession,
+    *,
+    original_speed: bool = False,
+    size: tuple[int, int] = (120, 40),
+) -> Dict[str, List[float]]:
+    """Drive a headless Tusk through a recorded session.
+
+    The initial document is written to a temporary file, and Tusk's data
+    directory (drafts, history, sessions, index, settings, logs) points at a
+    scratch directory, so replaying never touches the user's notes or
+    profile.
+
+    Returns:
+        Per-key latencies in seconds, grouped by key name, plus an "all" entry.
+    """
+    from tusk.app import Tusk
+
+    latencies: Dict[str, List[float]] = {"all": []}
+    with tempfile.TemporaryDirectory(prefix="tusk-replay-") as tmp_dir:
+        name = Path(session.file_name).name or "session.md"
+        file_path = Path(tmp_dir) / name
+        file_path.write_text(session.initial_text, encoding="utf-8")
+
+        app = Tusk(file_path=file_path, data_dir=Path(tmp_dir) / "data")
+        async with app.run_test(size=size) as pilot:
+            await pilot.pause()
+            started = time.perf_counter()
+            for recorded in session.keys:
+                if original_speed:
+                    delay = recorded.offset - (time.perf_counter() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                before = time.perf_counter()
+                await pilot.press(recorded.key)
+                elapsed = time.perf_counter() - before
+                latencies["all"].append(elapsed)
+                latencies.setdefault(recorded.key, []).append(elapsed)
+    return latencies
+
+
+def format_report(latencies: Dict[str, List[float]], top: int = 5) -> str:
+    """Render latency distributions as plain text."""
+    lines = ["All keys:"]
+    for label, value in latency_summary(latencies.get("all", [])):
+        if label == "count":
+            lines.append(f"  {label}: {int(value)}")
+        else:
+            lines.append(f"  {label}: {value:.2f} ms")
+
+    per_key = [
+        (key, max(samples)) for key, samples in latencies.items() if key != "all"
+    ]
+    per_key.sort(key=lambda item: item[1], reverse=True)
+    if per_key:
+        lines.append("Slowest keys:")
+        for key, worst in per_key[:top]:
+            lines.append(f"  {key}: {worst * 1000:.2f} ms")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded Tusk session and report key latencies"
+    )
+    parser.add_argument("session", help="Session file written by --record-session")
+    parser.add_argument(
+        "--speed",
+        choices=["max", "original"],
+        default="max",
+        help="Replay as fast as possible or with the recorded timing",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the latency summary as JSON"
+    )
+    args = parser.parse_args()
+
+    try:
+        session = load_session(Path(args.session))
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+    if not session.complete:
+        print(
+            f"Note: the session was cut short; replaying its first "
+            f"{len(session.keys)} keys",
+            file=sys.stderr,
+        )
+
+    latencies = asyncio.run(
+        replay_session(session, original_speed=args.speed == "original")
+    )
+    if args.json:
+        summary = {
+            key: dict(latency_summary(samples)) for key, samples in latencies.items()
+        }
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_report(latencies))
+
+
+if __name__ == "__main__":
+    main()
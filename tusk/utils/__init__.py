@@ -1,6 +1,17 @@
 from tusk.utils.cache import CacheManager
 from tusk.utils.complete import AutoComplete
+from tusk.utils.drafts import DraftStore
+from tusk.utils.highlight import HighlightCache
+from tusk.utils.preview import PreviewMarkdown
 from tusk.utils.save import AutoSave
 from tusk.utils.snippets import AutoSnippets
 
-__all__ = ["AutoSave", "AutoComplete", "AutoSnippets", "CacheManager"]
+__all__ = [
+    "AutoSave",
+    "AutoComplete",
+    "AutoSnippets",
+    "CacheManager",
+    "DraftStore",
+    "HighlightCache",
+    "PreviewMarkdown",
+]
@@ -12,16 +12,18 @@ SETTINGS_FILE = CACHE_DIR / "settings.json"
 class CacheManager:
     """Manages basic application settings."""
 
-    def __init__(self, app: App):
+    def __init__(self, app: App, cache_dir: Path = CACHE_DIR):
         self.app = app
+        self.cache_dir = cache_dir
+        self.settings_file = cache_dir / SETTINGS_FILE.name
         self._ensure_cache_dir()
 
-        if not SETTINGS_FILE.exists():
+        if not self.settings_file.exists():
             self.save_settings("global", self._get_default_settings())
 
     def _ensure_cache_dir(self):
         """Ensure cache directory exists."""
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
 
     def _get_default_settings(self) -> Dict[str, Any]:
         """Get default settings dictionary."""
@@ -29,6 +31,12 @@ class CacheManager:
             "theme": "default",
             "input_width": 50,
             "show_preview": True,
+            "draft_retention_days": 30,
+            "draft_max_count": 200,
+            "spellcheck": True,
+            "history_max_snapshots": 200,
+            "notes_dir": "",
+            "edit_latency_budget_ms": 25,
         }
 
         return default_settings
@@ -41,9 +49,9 @@ class CacheManager:
 
             # Load existing settings or create new
             all_settings = {}
-            if SETTINGS_FILE.exists():
+            if self.settings_file.exists():
                 try:
-                    with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+                    with open(self.settings_file, "r", encoding="utf-8") as f:
                         all_settings = json.load(f)
                 except json.JSONDecodeError:
                     self.app.notify(
@@ -54,7 +62,7 @@ class CacheManager:
             all_settings[file_path] = settings
 
             # Save all settings
-            with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
+            with open(self.settings_file, "w", encoding="utf-8") as f:
                 json.dump(all_settings, f, indent=2)
 
             self.app.notify("Settings saved successfully", severity="information")
@@ -67,13 +75,13 @@ class CacheManager:
         default_settings = self._get_default_settings()
 
         try:
-            if not SETTINGS_FILE.exists():
+            if not self.settings_file.exists():
                 self.app.notify(
                     "No settings file found, using defaults", severity="information"
                 )
                 return default_settings
 
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+            with open(self.settings_file, "r", encoding="utf-8") as f:
                 all_settings = json.load(f)
 
             if file_path:
@@ -88,3 +96,18 @@ class CacheManager:
         except Exception as e:
             self.app.notify(f"Error loading settings: {e}", severity="error")
             return default_settings
+
+    def load_file_settings(self, file_path: str) -> Dict[str, Any]:
+        """Load only the settings saved for one file, without defaults.
+
+        Returns an empty dict if the file has no entry.
+        """
+        try:
+            with open(self.settings_file, "r", encoding="utf-8") as f:
+                file_settings = json.load(f).get(file_path, {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.app.notify(f"Error loading settings: {e}", severity="error")
+            return {}
+        return file_settings if isinstance(file_settings, dict) else {}
@@ -0,0 +1,184 @@
+from functools import partial
+from typing import Any, Callable, List, NamedTuple, Optional
+
+Scheduler = Callable[[float, Callable[[], None]], Any]
+
+
+class TextDelta(NamedTuple):
+    """A single replacement: old[start:start + len(removed)] became inserted."""
+
+    start: int
+    removed: str
+    inserted: str
+
+    @property
+    def end(self) -> int:
+        """End offset of the replaced range in the old text."""
+        return self.start + len(self.removed)
+
+
+class ChangeEvent(NamedTuple):
+    version: int
+    delta: TextDelta
+    previous: str
+    text: str
+    reset: bool = False
+
+
+ChangeCallback = Callable[[List[ChangeEvent]], None]
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Length of the common prefix, found by halving slice comparisons."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[low:mid] == b[low:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix, not reaching back past limit characters."""
+    low, high = 0, limit
+    len_a, len_b = len(a), len(b)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len_a - mid : len_a - low] == b[len_b - mid : len_b - low]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def compute_delta(old: str, new: str) -> Optional[TextDelta]:
+    """Describe how old became new as one replacement, or None if equal."""
+    if old is new or old == new:
+        return None
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    return TextDelta(
+        prefix, old[prefix : len(old) - suffix], new[prefix : len(new) - suffix]
+    )
+
+
+class Subscription:
+    """A subscriber and the pending events it has not been given yet."""
+
+    def __init__(
+        self, callback: ChangeCallback, delay: Optional[float], debounce: bool
+    ) -> None:
+        self.callback = callback
+        self.delay = delay
+        self.debounce = debounce
+        self.pending: List[ChangeEvent] = []
+        self.timer: Any = None
+        self.active = True
+
+
+class ChangeBus:
+    """Turns editor updates into versioned deltas and fans them out.
+
+    Subscribers pick their own scheduling: immediate delivery, throttled
+    delivery at most once per delay, or debounced delivery once edits pause.
+    Delayed subscribers receive every event since their last delivery, so
+    incremental consumers can replay the deltas in order.
+    """
+
+    def __init__(self, scheduler: Scheduler, text: str = "") -> None:
+        self.scheduler = scheduler
+        self.version = 0
+        self.text = text
+        self._subscriptions: List[Subscription] = []
+
+    def subscribe(
+        self,
+        callback: ChangeCallback,
+        *,
+        delay: Optional[float] = None,
+        debounce: bool = False,
+    ) -> Subscription:
+        """Register a consumer.
+
+        Args:
+            callback: Called with the list of events since its last call.
+            delay: None for immediate delivery, otherwise seconds to wait.
+            debounce: Restart the delay on every event instead of throttling.
+        """
+        subscription = Subscription(callback, delay, debounce)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def reschedule(
+        self,
+        subscription: Subscription,
+        *,
+        delay: Optional[float] = None,
+        debounce: bool = False,
+    ) -> None:
+        """Change how a subscription is scheduled, keeping its pending events.
+
+        Switching to immediate delivery flushes anything pending right away.
+        """
+        if subscription.delay == delay and subscription.debounce == debounce:
+            return
+        subscription.delay = delay
+        subscription.debounce = debounce
+        self._stop_timer(subscription)
+        if delay is None:
+            self.flush(subscription)
+        elif subscription.pending:
+            subscription.timer = self.scheduler(delay, lambda: self.flush(subscription))
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.active = False
+        self._stop_timer(subscription)
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, text: str) -> Optional[ChangeEvent]:
+        """Record a new editor text; returns None if nothing changed."""
+        delta = compute_delta(self.text, text)
+        if delta is None:
+            return None
+        return self._dispatch(delta, text, reset=False)
+
+    def reset(self, text: str) -> ChangeEvent:
+        """Replace the whole document, e.g. after loading a file."""
+        delta = TextDelta(0, self.text, text)
+        return self._dispatch(delta, text, reset=True)
+
+    def flush(self, subscription: Subscription) -> None:
+        """Deliver a subscription's pending events now."""
+        self._stop_timer(subscription)
+        if not subscription.active or not subscription.pending:
+            return
+        events, subscription.pending = subscription.pending, []
+        subscription.callback(events)
+
+    def flush_all(self) -> None:
+        for subscription in list(self._subscriptions):
+            self.flush(subscription)
+
+    def _dispatch(self, delta: TextDelta, text: str, *, reset: bool) -> ChangeEvent:
+        self.version += 1
+        event = ChangeEvent(self.version, delta, self.text, text, reset)
+        self.text = text
+        for subscription in list(self._subscriptions):
+            subscription.pending.append(event)
+            if subscription.delay is None:
+                self.flush(subscription)
+            elif subscription.debounce or subscription.timer is None:
+                self._stop_timer(subscription)
+                subscription.timer = self.scheduler(
+                    subscription.delay, partial(self.flush, subscription)
+                )
+        return event
+
+    @staticmethod
+    def _stop_timer(subscription: Subscription) -> None:
+        if subscription.timer is not None:
+            subscription.timer.stop()
+            subscription.timer = None
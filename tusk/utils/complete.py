@@ -3,6 +3,16 @@ import re
 from textual import events
 from textual.widgets import TextArea
 
+FENCE_RE = re.compile(r"\s*```")
+# Line-local checks only look at this many leading characters, so a
+# megabyte-long line costs no more than a short one.
+LINE_HEAD = 256
+
+
+def is_fence_line(line: str) -> bool:
+    """Return True if line opens or closes a fenced code block."""
+    return FENCE_RE.match(line) is not None
+
 
 class AutoComplete(TextArea):
     """A TextArea widget with enhanced auto-completion, smart editing, and productivity features.
@@ -21,10 +31,9 @@ class AutoComplete(TextArea):
 
     def _get_current_line(self) -> str:
         """Get the content of the current line."""
-        cursor_row, cursor_col = self.cursor_location
-        lines = self.text.split("\n")
-        if cursor_row < len(lines):
-            return lines[cursor_row]
+        cursor_row, _ = self.cursor_location
+        if cursor_row < self.document.line_count:
+            return self.document.get_line(cursor_row)
         return ""
 
     def _get_line_indent(self, line: str) -> str:
@@ -35,13 +44,12 @@ class AutoComplete(TextArea):
     def _is_in_code_block(self) -> bool:
         """Check if cursor is inside a code block."""
         cursor_row, _ = self.cursor_location
-        lines = self.text.split("\n")
+        last_row = min(cursor_row, self.document.line_count - 1)
 
         code_block_count = 0
-        for i in range(cursor_row + 1):
-            if i < len(lines):
-                if lines[i].strip().startswith("```"):
-                    code_block_count += 1
+        for i in range(last_row + 1):
+            if is_fence_line(self.document.get_line(i)):
+                code_block_count += 1
 
         return code_block_count % 2 == 1
 
@@ -60,6 +68,8 @@ class AutoComplete(TextArea):
 
         current_line = self._get_current_line()
         indent = self._get_line_indent(current_line)
+        # Markers live at the start of a line; a long line's tail is irrelevant.
+        head = current_line[:LINE_HEAD].rstrip()
 
         # Handle list items
         list_patterns = [
@@ -70,7 +80,7 @@ class AutoComplete(TextArea):
         ]
 
         for pattern, replacement in list_patterns:
-            match = re.match(pattern, current_line.rstrip())
+            match = re.match(pattern, head)
             if match:
                 if pattern.startswith(r"^(\s*)(\d+\.)"):
                     # For ordered lists, increment the number
@@ -80,10 +90,12 @@ class AutoComplete(TextArea):
                     except ValueError:
                         new_indent = f"{indent}1. "
                 else:
-                    new_indent = re.sub(pattern, replacement, current_line.rstrip())
+                    new_indent = match.expand(replacement)
 
                 # If the line is empty after the marker, remove the marker
-                if len(current_line.strip()) <= len(match.group(2)) + 1:
+                if len(current_line) <= LINE_HEAD and len(head.strip()) <= (
+                    len(match.group(2)) + 1
+                ):
                     self.insert("\n")
                 else:
                     self.insert(f"\n{new_indent}")
@@ -91,7 +103,7 @@ class AutoComplete(TextArea):
                 return True
 
         # Handle code blocks
-        if current_line.strip().startswith("```"):
+        if is_fence_line(current_line):
             self.insert(f"\n{indent}")
             event.prevent_default()
             return True
@@ -130,7 +142,7 @@ class AutoComplete(TextArea):
         # Handle special markdown cases
         if event.character in ["*", "_"]:
             # Check for double characters for bold/strong
-            before_cursor = current_line[:cursor_col]
+            before_cursor = current_line[max(0, cursor_col - 2) : cursor_col]
             if before_cursor.endswith(event.character):
                 # User is typing ** or __, complete with closing pair
                 self.insert(event.character + event.character)
@@ -140,7 +152,7 @@ class AutoComplete(TextArea):
 
         # Handle backticks for code blocks
         if event.character == "`":
-            before_cursor = current_line[:cursor_col]
+            before_cursor = current_line[max(0, cursor_col - 2) : cursor_col]
             if before_cursor.endswith("``"):
                 # User is typing ```, complete code block
                 self.insert("`\n\n```")
@@ -154,46 +166,49 @@ class AutoComplete(TextArea):
         event.prevent_default()
         return True
 
+    def _swap_lines(self, upper: int) -> None:
+        """Swap line upper with the line below it, editing only those two."""
+        first = self.document.get_line(upper)
+        second = self.document.get_line(upper + 1)
+        self.replace(
+            f"{second}\n{first}",
+            (upper, 0),
+            (upper + 1, len(second)),
+            maintain_selection_offset=False,
+        )
+
     def action_duplicate_line(self) -> None:
         """Duplicate the current line."""
         cursor_row, cursor_col = self.cursor_location
-        lines = self.text.split("\n")
 
-        if cursor_row < len(lines):
-            current_line = lines[cursor_row]
+        if cursor_row < self.document.line_count:
+            current_line = self.document.get_line(cursor_row)
             # Insert the duplicated line below current line
-            lines.insert(cursor_row + 1, current_line)
-            self.text = "\n".join(lines)
+            self.insert(
+                f"\n{current_line}",
+                (cursor_row, len(current_line)),
+                maintain_selection_offset=False,
+            )
             # Move cursor to the duplicated line
             self.cursor_location = (cursor_row + 1, cursor_col)
 
     def action_move_line_up(self) -> None:
         """Move the current line up."""
         cursor_row, cursor_col = self.cursor_location
-        lines = self.text.split("\n")
 
-        if cursor_row > 0 and cursor_row < len(lines):
+        if cursor_row > 0 and cursor_row < self.document.line_count:
             # Swap current line with the line above
-            lines[cursor_row], lines[cursor_row - 1] = (
-                lines[cursor_row - 1],
-                lines[cursor_row],
-            )
-            self.text = "\n".join(lines)
+            self._swap_lines(cursor_row - 1)
             # Move cursor up with the line
             self.cursor_location = (cursor_row - 1, cursor_col)
 
     def action_move_line_down(self) -> None:
         """Move the current line down."""
         cursor_row, cursor_col = self.cursor_location
-        lines = self.text.split("\n")
 
-        if cursor_row < len(lines) - 1:
+        if cursor_row < self.document.line_count - 1:
             # Swap current line with the line below
-            lines[cursor_row], lines[cursor_row + 1] = (
-                lines[cursor_row + 1],
-                lines[cursor_row],
-            )
-            self.text = "\n".join(lines)
+            self._swap_lines(cursor_row)
             # Move cursor down with the line
             self.cursor_location = (cursor_row + 1, cursor_col)
 
@@ -0,0 +1,296 @@
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, TypedDict
+
+from tusk.utils.locking import file_lock
+
+DRAFT_DIR = Path.home() / ".tusk" / "drafts"
+INDEX_NAME = "index.json"
+LOCK_NAME = "index.lock"
+INDEX_VERSION = 1
+TITLE_SCAN_CHARS = 512
+# Empty drafts younger than this may have just been opened by another
+# instance, so garbage collection leaves them alone.
+EMPTY_GRACE_SECONDS = 3600
+
+
+class DraftEntry(TypedDict):
+    title: str
+    size: int
+    mtime: float
+    first_line: str
+
+
+class DraftInfo(NamedTuple):
+    path: Path
+    title: str
+    size: int
+    mtime: float
+    first_line: str
+
+
+class DraftStore:
+    """Keeps a small on-disk index of drafts so they never need to be scanned.
+
+    The index records title, size, mtime and first line for every draft. It
+    is updated in memory as drafts are written and flushed explicitly, so
+    listing recent drafts at startup costs one JSON read instead of a stat
+    per file. Several Tusk instances share the index: flushes merge with
+    what is on disk under a lock, and garbage collection checks the files
+    themselves before deleting anything.
+    """
+
+    def __init__(
+        self,
+        draft_dir: Path = DRAFT_DIR,
+        *,
+        retention_days: int = 30,
+        max_drafts: int = 200,
+    ) -> None:
+        self.draft_dir = draft_dir
+        self.index_file = draft_dir / INDEX_NAME
+        self.lock_file = draft_dir / LOCK_NAME
+        self.retention_days = retention_days
+        self.max_drafts = max_drafts
+        self._entries: Dict[str, DraftEntry] = {}
+        self._removed: Set[str] = set()
+        self._dirty = False
+        self.draft_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _read_index(self) -> Dict[str, DraftEntry]:
+        data = json.loads(self.index_file.read_text(encoding="utf-8"))
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError("unsupported draft index version")
+        drafts: Dict[str, DraftEntry] = data["drafts"]
+        if not isinstance(drafts, dict):
+            raise ValueError("malformed draft index")
+        for entry in drafts.values():
+            if not (
+                isinstance(entry["title"], str)
+                and isinstance(entry["size"], int)
+                and isinstance(entry["mtime"], (int, float))
+                and isinstance(entry["first_line"], str)
+            ):
+                raise ValueError("malformed draft index entry")
+        return dict(drafts)
+
+    def _load_index(self) -> None:
+        """Load the index, rebuilding it from the directory if it is unusable."""
+        try:
+            self._entries = self._read_index()
+        except (OSError, ValueError, KeyError, TypeError):
+            self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        """Scan the draft directory once and index every draft found."""
+        self._entries = {}
+        for path in self.draft_dir.glob("draft-*.md"):
+            try:
+                stat = path.stat()
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    head = f.read(TITLE_SCAN_CHARS)
+            except OSError:
+                continue
+            self._entries[path.name] = self._make_entry(
+                head, stat.st_size, stat.st_mtime
+            )
+        self._dirty = True
+        self.flush()
+
+    @staticmethod
+    def _make_entry(head: str, size: int, mtime: float) -> DraftEntry:
+        lines = head[:TITLE_SCAN_CHARS].splitlines()
+        first_line = next((line.strip() for line in lines if line.strip()), "")
+        title = first_line
+        for line in lines:
+            stripped = line.strip()
+            if stripped.startswith("#"):
+                title = stripped.lstrip("#").strip() or title
+                break
+        return {
+            "title": title,
+            "size": size,
+            "mtime": mtime,
+            "first_line": first_line,
+        }
+
+    def _info(self, name: str, entry: DraftEntry) -> DraftInfo:
+        return DraftInfo(
+            path=self.draft_dir / name,
+            title=entry["title"] or name,
+            size=entry["size"],
+            mtime=entry["mtime"],
+            first_line=entry["first_line"],
+        )
+
+    def create(self) -> Path:
+        """Create and index a new empty draft file."""
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        name = f"draft-{timestamp}.md"
+        counter = 1
+        while True:
+            # The index answers most collisions; exclusive create catches the
+            # rest (e.g. another Tusk instance created the same name).
+            if name not in self._entries:
+                draft_path = self.draft_dir / name
+                try:
+                    with open(draft_path, "x", encoding="utf-8"):
+                        pass
+                    break
+                except FileExistsError:
+                    pass
+            name = f"draft-{timestamp}-{counter}.md"
+            counter += 1
+
+        self._entries[name] = self._make_entry("", 0, time.time())
+        self._dirty = True
+        self.flush()
+        return draft_path
+
+    def contains(self, path: Path) -> bool:
+        """Return True if path lives in the draft directory."""
+        try:
+            return path.is_relative_to(self.draft_dir)
+        except ValueError:
+            return False
+
+    def record(self, path: Path, content: str) -> None:
+        """Refresh the index entry for a draft after it has been written."""
+        if not self.contains(path):
+            return
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        previous = self._entries.get(path.name)
+        self._entries[path.name] = self._make_entry(
+            content[:TITLE_SCAN_CHARS], stat.st_size, stat.st_mtime
+        )
+        self._dirty = True
+        # Until the index shows a size, another instance's garbage
+        # collection would take the draft for an empty one.
+        if stat.st_size and (previous is None or not previous["size"]):
+            self.flush()
+
+    def remove(self, path: Path) -> None:
+        """Delete a draft and drop it from the index."""
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        if self._entries.pop(path.name, None) is not None:
+            self._dirty = True
+        self._removed.add(path.name)
+
+    def recent(self, limit: int = 20) -> List[DraftInfo]:
+        """Return the most recently modified drafts, straight from the index."""
+        ordered = sorted(
+            self._entries.items(),
+            key=lambda item: item[1]["mtime"],
+            reverse=True,
+        )
+        return [self._info(name, entry) for name, entry in ordered[:limit]]
+
+    def collect_garbage(self, keep: Optional[Path] = None) -> int:
+        """Remove empty drafts, drafts past retention and any over the limit.
+
+        Args:
+            keep: A draft that must survive collection, usually the open one.
+
+        Returns:
+            The number of drafts removed.
+        """
+        keep_name = keep.name if keep and self.contains(keep) else None
+        # The index may lag behind the files (a crash before flushing, or
+        # another instance writing), so candidates are re-checked on disk
+        # and the selection is repeated with their real size and mtime.
+        candidates = self._doomed(keep_name)
+        for name in candidates:
+            path = self.draft_dir / name
+            try:
+                stat = path.stat()
+            except OSError:
+                self._entries.pop(name, None)
+                self._dirty = True
+                continue
+            entry = self._entries[name]
+            if (entry["size"], entry["mtime"]) != (
+                stat.st_size,
+                stat.st_mtime,
+            ):
+                try:
+                    with open(path, "r", encoding="utf-8", errors="replace") as f:
+                        head = f.read(TITLE_SCAN_CHARS)
+                except OSError:
+                    continue
+                self._entries[name] = self._make_entry(
+                    head, stat.st_size, stat.st_mtime
+                )
+                self._dirty = True
+
+        doomed = [name for name in self._doomed(keep_name) if name in candidates]
+        for name in doomed:
+            self.remove(self.draft_dir / name)
+        self.flush()
+        return len(doomed)
+
+    def _doomed(self, keep_name: Optional[str]) -> List[str]:
+        """Drafts the index says are empty, expired or over the limit."""
+        now = time.time()
+        cutoff = now - self.retention_days * 86400
+        ordered = sorted(
+            self._entries.items(),
+            key=lambda item: item[1]["mtime"],
+            reverse=True,
+        )
+        doomed: List[str] = []
+        kept = 0
+        for name, entry in ordered:
+            if name == keep_name:
+                kept += 1
+                continue
+            mtime = entry["mtime"]
+            empty = entry["size"] == 0 and mtime < now - EMPTY_GRACE_SECONDS
+            expired = self.retention_days > 0 and mtime < cutoff
+            over_limit = self.max_drafts > 0 and kept >= self.max_drafts
+            if empty or expired or over_limit:
+                doomed.append(name)
+            else:
+                kept += 1
+        return doomed
+
+    def _merge_disk_index(self) -> None:
+        """Fold in entries other instances wrote since this index was read."""
+        try:
+            disk = self._read_index()
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        for name, entry in disk.items():
+            if name in self._removed:
+                continue
+            mine = self._entries.get(name)
+            if mine is None or entry["mtime"] > mine["mtime"]:
+                self._entries[name] = entry
+        for name in [name for name in self._entries if name not in disk]:
+            # Removed elsewhere, unless it is a draft this instance created.
+            if not (self.draft_dir / name).exists():
+                del self._entries[name]
+
+    def flush(self) -> None:
+        """Merge with the index on disk and write it, if anything changed."""
+        if not self._dirty:
+            return
+        tmp_file = self.index_file.with_suffix(".tmp")
+        try:
+            with file_lock(self.lock_file):
+                self._merge_disk_index()
+                data = {"version": INDEX_VERSION, "drafts": self._entries}
+                tmp_file.write_text(json.dumps(data), encoding="utf-8")
+                tmp_file.replace(self.index_file)
+            self._dirty = False
+            self._removed.clear()
+        except OSError:
+            pass
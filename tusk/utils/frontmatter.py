@@ -0,0 +1,328 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+INDEX_FILE = Path.home() / ".tusk" / "index" / "frontmatter.json"
+INDEX_VERSION = 1
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+SKIPPED_DIRS = {"node_modules", "__pycache__", "venv"}
+# Front matter longer than this is treated as absent rather than read in full.
+MAX_FRONT_MATTER_LINES = 200
+TAG_KEYS = ("tags", "tag", "keywords")
+
+FieldValue = Union[str, List[str]]
+Fields = Dict[str, FieldValue]
+
+
+class NoteEntry(NamedTuple):
+    path: Path
+    fields: Fields
+
+    @property
+    def title(self) -> str:
+        title = self.fields.get("title")
+        return title if isinstance(title, str) and title else self.path.stem
+
+    @property
+    def tags(self) -> List[str]:
+        for key in TAG_KEYS:
+            value = self.fields.get(key)
+            if value:
+                return value if isinstance(value, list) else [value]
+        return []
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def parse_front_matter(block: str) -> Fields:
+    """Parse the subset of YAML used in note front matter.
+
+    Supports top-level "key: value" pairs, inline lists ("[a, b]") and block
+    lists ("- a" lines under an empty key). Nested mappings are ignored.
+    Tag fields given as a plain string are split on commas and spaces.
+    """
+    fields: Fields = {}
+    list_key: Optional[str] = None
+    for raw in block.splitlines():
+        line = raw.rstrip()
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and list_key is not None:
+            items = fields.setdefault(list_key, [])
+            if isinstance(items, list):
+                items.append(_unquote(stripped[2:]))
+            continue
+        if line[0].isspace() or ":" not in line:
+            continue
+        key, _, value = line.partition(":")
+        key = key.strip().lower()
+        value = value.strip()
+        list_key = None
+        if not value:
+            list_key = key
+            fields[key] = []
+        elif value.startswith("[") and value.endswith("]"):
+            fields[key] = [
+                _unquote(item) for item in value[1:-1].split(",") if item.strip()
+            ]
+        elif key in TAG_KEYS:
+            fields[key] = [
+                _unquote(item)
+                for item in value.replace(",", " ").split()
+                if _unquote(item)
+            ]
+        else:
+            fields[key] = _unquote(value)
+    return fields
+
+
+def _front_matter_lines(lines: Iterator[str]) -> Optional[str]:
+    first = next(lines, "")
+    if first.strip() != "---":
+        return None
+    block: List[str] = []
+    for count, line in enumerate(lines):
+        if line.strip() in ("---", "..."):
+            return "".join(block)
+        if count >= MAX_FRONT_MATTER_LINES:
+            break
+        block.append(line)
+    return None
+
+
+def read_front_matter(path: Path) -> Optional[str]:
+    """Read only the front matter block of a file, or None if it has none."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return _front_matter_lines(iter(f))
+    except OSError:
+        return None
+
+
+def front_matter_of(text: str) -> Optional[str]:
+    """Extract the front matter block from text already in memory."""
+    if not text.startswith("---"):
+        return None
+    head = text.split("\n", MAX_FRONT_MATTER_LINES + 2)[: MAX_FRONT_MATTER_LINES + 2]
+    return _front_matter_lines(iter(line + "\n" for line in head))
+
+
+class NoteIndex:
+    """Front-matter index over Markdown notes with inverted field postings.
+
+    The on-disk index stores mtime, size and parsed fields per file, so a
+    rescan only reads the front matter of files that changed. In memory,
+    every (field, value) pair maps to the set of files carrying it, so
+    queries are set intersections rather than scans.
+
+    The stored index is only read by load (called from scan), so creating
+    an index costs nothing on the UI thread.
+    """
+
+    def __init__(self, index_file: Path = INDEX_FILE) -> None:
+        self.index_file = index_file
+        self._files: Dict[str, Tuple[int, int, Fields]] = {}
+        self._postings: Dict[Tuple[str, str], Set[str]] = {}
+        self._dirty = False
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def load(self) -> None:
+        """Read the stored index once; entries updated since are kept."""
+        if self._loaded:
+            return
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                raise ValueError("unsupported front matter index version")
+            files = data["files"]
+        except (OSError, ValueError, KeyError, TypeError):
+            files = {}
+        with self._lock:
+            for name, (mtime_ns, size, fields) in files.items():
+                if name not in self._files:
+                    self._set(name, int(mtime_ns), int(size), dict(fields))
+            self._loaded = True
+
+    @staticmethod
+    def _terms(fields: Fields) -> Iterator[Tuple[str, str]]:
+        for key, value in fields.items():
+            values = value if isinstance(value, list) else [value]
+            if key in TAG_KEYS:
+                key = "tags"
+            for item in values:
+                yield key, str(item).lower()
+
+    def _set(self, name: str, mtime_ns: int, size: int, fields: Fields) -> None:
+        previous = self._files.get(name)
+        if previous is not None:
+            for term in self._terms(previous[2]):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.discard(name)
+                    if not postings:
+                        del self._postings[term]
+        self._files[name] = (mtime_ns, size, fields)
+        for term in self._terms(fields):
+            self._postings.setdefault(term, set()).add(name)
+
+    def _drop(self, name: str) -> None:
+        self._set(name, 0, 0, {})
+        del self._files[name]
+
+    def scan(self, root: Path) -> int:
+        """Index every Markdown file under root, reading only changed files.
+
+        Returns:
+            The number of files whose front matter was (re)read.
+        """
+        self.load()
+        root = root.resolve()
+        prefix = str(root) + os.sep
+        seen: Set[str] = set()
+        updated = 0
+        for path, stat in self._walk(root):
+            name = str(path)
+            seen.add(name)
+            with self._lock:
+                known = self._files.get(name)
+            if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                continue
+            block = read_front_matter(path)
+            fields = parse_front_matter(block) if block else {}
+            with self._lock:
+                self._set(name, stat.st_mtime_ns, stat.st_size, fields)
+                self._dirty = True
+            updated += 1
+
+        with self._lock:
+            missing = [
+                name
+                for name in self._files
+                if name.startswith(prefix) and name not in seen
+            ]
+            for name in missing:
+                self._drop(name)
+            if missing:
+                self._dirty = True
+        return updated
+
+    @staticmethod
+    def _walk(root: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIPPED_DIRS:
+                            stack.append(Path(entry.path))
+                    elif entry.name.lower().endswith(MARKDOWN_SUFFIXES):
+                        yield Path(entry.path), entry.stat()
+                except OSError:
+                    continue
+
+    def update(self, path: Path, text: str) -> None:
+        """Refresh one file from text that was just written to it."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        block = front_matter_of(text)
+        fields = parse_front_matter(block) if block else {}
+        name = str(path.resolve())
+        with self._lock:
+            known = self._files.get(name)
+            if known and known[2] == fields:
+                # Only the stat changed; keep postings as they are.
+                self._files[name] = (stat.st_mtime_ns, stat.st_size, fields)
+            else:
+                self._set(name, stat.st_mtime_ns, stat.st_size, fields)
+            self._dirty = True
+
+    def query(self, query: str, limit: int = 50) -> List[NoteEntry]:
+        """Return notes matching every term of a query.
+
+        Terms are "#tag", "field:value" (e.g. "status:draft") or plain words
+        matched against the title and file name.
+        """
+        filters: List[Tuple[str, str]] = []
+        words: List[str] = []
+        for term in query.lower().split():
+            if term.startswith("#") and len(term) > 1:
+                filters.append(("tags", term[1:]))
+            elif ":" in term and not term.startswith(":") and not term.endswith(":"):
+                key, _, value = term.partition(":")
+                filters.append(("tags" if key in TAG_KEYS else key, value))
+            else:
+                words.append(term)
+
+        with self._lock:
+            if filters:
+                candidate_sets = sorted(
+                    (self._postings.get(term, set()) for term in filters), key=len
+                )
+                names = set(candidate_sets[0])
+                for postings in candidate_sets[1:]:
+                    names &= postings
+            else:
+                names = set(self._files)
+
+            results: List[NoteEntry] = []
+            for name in sorted(names):
+                entry = NoteEntry(Path(name), self._files[name][2])
+                haystack = f"{entry.title} {entry.path.name}".lower()
+                if all(word in haystack for word in words):
+                    results.append(entry)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def tags(self) -> Dict[str, int]:
+        """Count of notes per tag."""
+        with self._lock:
+            return {
+                value: len(names)
+                for (key, value), names in self._postings.items()
+                if key == "tags"
+            }
+
+    def flush(self) -> None:
+        """Write the index to disk if it changed."""
+        with self._lock:
+            # Before load, writing would drop every stored entry not in memory.
+            if not self._dirty or not self._loaded:
+                return
+            data = {
+                "version": INDEX_VERSION,
+                "files": {
+                    name: [mtime_ns, size, fields]
+                    for name, (mtime_ns, size, fields) in self._files.items()
+                },
+            }
+            self._dirty = False
+        tmp_file = self.index_file.with_suffix(".tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(json.dumps(data, separators=(",", ":")), "utf-8")
+            tmp_file.replace(self.index_file)
+        except OSError:
+            with self._lock:
+                self._dirty = True
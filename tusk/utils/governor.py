@@ -0,0 +1,121 @@
+import time
+from enum import IntEnum
+from typing import Callable, Dict, Optional
+
+
+class GovernorLevel(IntEnum):
+    FULL = 0
+    THROTTLED = 1
+    DEFERRED = 2
+    PAUSED = 3
+
+
+LEVEL_LABELS = {
+    GovernorLevel.FULL: "full",
+    GovernorLevel.THROTTLED: "preview-throttled",
+    GovernorLevel.DEFERRED: "stats-deferred",
+    GovernorLevel.PAUSED: "preview-paused",
+}
+
+
+class PerformanceGovernor:
+    """Steps editor features down when edits get slow, and back up later.
+
+    Two signals are tracked as moving averages: the time spent handling an
+    edit synchronously, and the cost of each pipeline stage (preview, stats)
+    whenever it actually runs. The level rises one step when edits exceed
+    the latency budget or a single stage stalls the UI for several budgets.
+    It falls one step once the stages would fit comfortably inside the
+    budget again, so degrading never hides the cost it is waiting on.
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.025,
+        *,
+        smoothing: float = 0.3,
+        stall_factor: float = 4.0,
+        recover_ratio: float = 0.5,
+        patience: int = 3,
+        recover_after: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.budget = budget
+        self.smoothing = smoothing
+        self.stall_factor = stall_factor
+        self.recover_ratio = recover_ratio
+        self.patience = patience
+        self.recover_after = recover_after
+        self.clock = clock
+        self.level = GovernorLevel.FULL
+        self.edit_cost = 0.0
+        self.stage_costs: Dict[str, float] = {}
+        self._samples = 0
+        self._changed_at = clock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget > 0
+
+    @property
+    def label(self) -> str:
+        return LEVEL_LABELS[self.level]
+
+    @property
+    def estimated_cost(self) -> float:
+        """Expected time to run every stage for one edit at full fidelity."""
+        return sum(self.stage_costs.values())
+
+    def _average(self, previous: float, sample: float) -> float:
+        return previous + self.smoothing * (sample - previous)
+
+    def record_edit(self, elapsed: float) -> Optional[GovernorLevel]:
+        """Record the synchronous cost of one edit.
+
+        Returns:
+            The new level if it changed, otherwise None.
+        """
+        if not self.enabled:
+            return None
+        self.edit_cost = self._average(self.edit_cost, elapsed)
+        self._samples += 1
+        if self.edit_cost > self.budget:
+            return self._raise()
+        return self._maybe_recover()
+
+    def record_stage(self, name: str, elapsed: float) -> Optional[GovernorLevel]:
+        """Record how long one run of a pipeline stage took.
+
+        Returns:
+            The new level if it changed, otherwise None.
+        """
+        if not self.enabled:
+            return None
+        previous = self.stage_costs.get(name, elapsed)
+        self.stage_costs[name] = self._average(previous, elapsed)
+        if elapsed > self.budget * self.stall_factor:
+            self._samples += 1
+            return self._raise()
+        return self._maybe_recover()
+
+    def _raise(self) -> Optional[GovernorLevel]:
+        if self.level == GovernorLevel.PAUSED or self._samples < self.patience:
+            return None
+        return self._set_level(GovernorLevel(self.level + 1))
+
+    def _maybe_recover(self) -> Optional[GovernorLevel]:
+        if self.level == GovernorLevel.FULL:
+            return None
+        if self.clock() - self._changed_at < self.recover_after:
+            return None
+        if self.estimated_cost >= self.budget * self.recover_ratio:
+            return None
+        return self._set_level(GovernorLevel(self.level - 1))
+
+    def _set_level(self, level: GovernorLevel) -> GovernorLevel:
+        self.level = level
+        self._samples = 0
+        self._changed_at = self.clock()
+        # Edits are cheaper at the new level; measure them afresh.
+        self.edit_cost = 0.0
+        return level
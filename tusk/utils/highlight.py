@@ -0,0 +1,61 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from textual.content import Content
+from textual.highlight import highlight
+
+HighlightKey = Tuple[str, str, str]
+
+
+class HighlightCache:
+    """Thread-safe LRU cache of highlighted code blocks.
+
+    Entries are keyed by (language, block hash, theme) so a block that did
+    not change between preview updates is never highlighted twice.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[HighlightKey, Content]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(code: str, language: str, theme: str) -> HighlightKey:
+        """Build the cache key for a block of code."""
+        digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+        return (language or "", digest, theme)
+
+    def get(self, key: HighlightKey) -> Optional[Content]:
+        """Return the cached highlight for key, or None."""
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: HighlightKey, content: Content) -> None:
+        """Store a highlight, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def highlight(self, code: str, language: str, theme: str) -> Content:
+        """Highlight code, reusing and filling the cache. Safe to call off-thread."""
+        key = self.key(code, language, theme)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        content = highlight(code, language=language or None)
+        self.put(key, content)
+        return content
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
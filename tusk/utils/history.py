@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from tusk.utils.locking import file_lock
+
+HISTORY_DIR = Path.home() / ".tusk" / "history"
+MANIFEST_VERSION = 1
+# Unreferenced chunks younger than this are left alone by garbage collection,
+# in case an instance that does not take the lock is about to reference them.
+GC_GRACE_SECONDS = 3600
+
+# Chunk boundaries fall after lines whose hash matches BOUNDARY_MASK, so an
+# edit only changes the chunks around it and the rest are shared with earlier
+# snapshots. Chunks are kept between MIN_CHUNK and MAX_CHUNK characters.
+MIN_CHUNK = 512
+MAX_CHUNK = 16384
+BOUNDARY_MASK = 0x1F
+
+
+class Snapshot(NamedTuple):
+    id: int
+    time: float
+    reason: str
+    size: int
+    digest: str
+    chunks: Tuple[str, ...]
+
+
+def split_chunks(text: str) -> List[str]:
+    """Split text into content-defined, line-aligned chunks."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in text.splitlines(keepends=True):
+        current.append(line)
+        size += len(line)
+        if size < MIN_CHUNK:
+            continue
+        boundary = zlib.crc32(line.encode("utf-8")) & BOUNDARY_MASK == 0
+        if boundary or size >= MAX_CHUNK:
+            chunks.append("".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class VersionStore:
+    """Local snapshot history for notes, deduplicated across versions.
+
+    Each snapshot is a list of chunk hashes; chunks are zlib-compressed and
+    stored once under their SHA-256, so saving a large note after a small
+    edit only writes the chunks that changed plus a manifest entry.
+    Manifests live in one JSON file per note, keyed by a hash of its path.
+    Instances share the store: manifest updates and garbage collection hold
+    an fcntl lock on history.lock, so neither loses the other's snapshots.
+    """
+
+    def __init__(
+        self,
+        history_dir: Path = HISTORY_DIR,
+        *,
+        max_snapshots: int = 200,
+        cache_chunks: int = 256,
+    ) -> None:
+        self.history_dir = history_dir
+        self.chunk_dir = history_dir / "chunks"
+        self.manifest_dir = history_dir / "manifests"
+        self.lock_file = history_dir / "history.lock"
+        self.max_snapshots = max_snapshots
+        self.cache_chunks = cache_chunks
+        self._chunk_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _manifest_path(self, path: Path) -> Path:
+        key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:32]
+        return self.manifest_dir / f"{key}.json"
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / digest
+
+    def _load_manifest(self, path: Path) -> Dict[str, Any]:
+        # Always read from disk so several Tusk instances can share history.
+        try:
+            data = json.loads(self._manifest_path(path).read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                raise ValueError("unsupported history manifest version")
+            data["snapshots"] = list(data["snapshots"])
+            return data
+        except (OSError, ValueError, KeyError, TypeError):
+            return {
+                "version": MANIFEST_VERSION,
+                "path": str(path),
+                "next_id": 1,
+                "snapshots": [],
+            }
+
+    def _write_manifest(self, path: Path, manifest: Dict[str, Any]) -> None:
+        target = self._manifest_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = target.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(manifest), encoding="utf-8")
+        tmp_file.replace(target)
+
+    def _store_chunk(self, chunk: str) -> str:
+        data = chunk.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        chunk_path = self._chunk_path(digest)
+        try:
+            # Reusing a chunk restarts its garbage collection grace period.
+            os.utime(chunk_path)
+        except OSError:
+            chunk_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = chunk_path.with_name(f"{digest}.{os.getpid()}.tmp")
+            tmp_file.write_bytes(zlib.compress(data, 6))
+            tmp_file.replace(chunk_path)
+        self._remember_chunk(digest, chunk)
+        return digest
+
+    def _remember_chunk(self, digest: str, chunk: str) -> None:
+        self._chunk_cache[digest] = chunk
+        self._chunk_cache.move_to_end(digest)
+        while len(self._chunk_cache) > self.cache_chunks:
+            self._chunk_cache.popitem(last=False)
+
+    def _read_chunk(self, digest: str) -> str:
+        chunk = self._chunk_cache.get(digest)
+        if chunk is not None:
+            self._chunk_cache.move_to_end(digest)
+            return chunk
+        data = zlib.decompress(self._chunk_path(digest).read_bytes())
+        chunk = data.decode("utf-8")
+        self._remember_chunk(digest, chunk)
+        return chunk
+
+    @staticmethod
+    def _snapshot(entry: Dict[str, Any]) -> Snapshot:
+        return Snapshot(
+            id=int(entry["id"]),
+            time=float(entry["time"]),
+            reason=str(entry.get("reason", "")),
+            size=int(entry.get("size", 0)),
+            digest=str(entry["digest"]),
+            chunks=tuple(entry["chunks"]),
+        )
+
+    def snapshot(self, path: Path, text: str, reason: str) -> Optional[Snapshot]:
+        """Record a version of path's content.
+
+        Returns:
+            The new snapshot, or None if text matches the latest snapshot.
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock, file_lock(self.lock_file):
+            manifest = self._load_manifest(path)
+            snapshots: List[Dict[str, Any]] = manifest["snapshots"]
+            if snapshots and snapshots[-1]["digest"] == digest:
+                return None
+
+            chunks = [self._store_chunk(chunk) for chunk in split_chunks(text)]
+            entry: Dict[str, Any] = {
+                "id": int(manifest.get("next_id", 1)),
+                "time": time.time(),
+                "reason": reason,
+                "size": len(text),
+                "digest": digest,
+                "chunks": chunks,
+            }
+            manifest["next_id"] = entry["id"] + 1
+            manifest["path"] = str(path)
+            snapshots.append(entry)
+            if self.max_snapshots > 0 and len(snapshots) > self.max_snapshots:
+                del snapshots[: len(snapshots) - self.max_snapshots]
+            self._write_manifest(path, manifest)
+            return self._snapshot(entry)
+
+    def snapshots(self, path: Path) -> List[Snapshot]:
+        """Return path's snapshots, newest first."""
+        with self._lock:
+            manifest = self._load_manifest(path)
+            entries: List[Dict[str, Any]] = manifest["snapshots"]
+            return [self._snapshot(entry) for entry in reversed(entries)]
+
+    def load(self, snapshot: Snapshot) -> str:
+        """Reassemble the text of a snapshot from its chunks."""
+        with self._lock:
+            return "".join(self._read_chunk(digest) for digest in snapshot.chunks)
+
+    def collect_garbage(self, grace: float = GC_GRACE_SECONDS) -> int:
+        """Delete chunks no longer referenced by any manifest.
+
+        Args:
+            grace: Minimum age in seconds of a chunk that may be deleted.
+
+        Returns:
+            The number of chunks removed.
+        """
+        cutoff = time.time() - grace
+        with self._lock, file_lock(self.lock_file):
+            referenced = set()
+            for manifest_path in self.manifest_dir.glob("*.json"):
+                try:
+                    data = json.loads(manifest_path.read_text(encoding="utf-8"))
+                    for entry in data["snapshots"]:
+                        referenced.update(entry["chunks"])
+                except (OSError, ValueError, KeyError, TypeError):
+                    # An unreadable manifest may still reference anything.
+                    return 0
+
+            removed = 0
+            for chunk_path in self.chunk_dir.glob("*/*"):
+                name = chunk_path.name
+                if name in referenced or name.endswith(".tmp"):
+                    continue
+                try:
+                    if chunk_path.stat().st_mtime >= cutoff:
+                        continue
+                    chunk_path.unlink()
+                    removed += 1
+                except OSError:
+                    continue
+                self._chunk_cache.pop(name, None)
+            return removed
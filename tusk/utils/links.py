@@ -0,0 +1,222 @@
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from textual._slug import TrackedSlugs
+
+from tusk.utils.complete import is_fence_line
+from tusk.utils.longlines import LONG_LINE_LIMIT
+
+# [text](target "title") and ![alt](target), allowing one level of nested
+# brackets in the text, e.g. [![badge](img.svg)](page.md).
+INLINE_LINK_RE = re.compile(
+    r"(!?)\[(?:[^\[\]]|\[[^\]]*\])*\]"
+    r"\(\s*(<[^>]*>|[^\s)]+)(?:\s+(?:\"[^\"]*\"|'[^']*'|\([^)]*\)))?\s*\)"
+)
+REFERENCE_RE = re.compile(r"^ {0,3}\[[^\]]+\]:\s*(<[^>]*>|\S+)")
+HTML_IMAGE_RE = re.compile(r"<img\s[^>]*?src=[\"']([^\"']+)[\"']", re.IGNORECASE)
+# Cheap test for lines that could hold any of the above.
+MAYBE_LINK_RE = re.compile(r"\]\(|\]:|<img", re.IGNORECASE)
+CODE_SPAN_RE = re.compile(r"`[^`]*`")
+SCHEME_RE = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*:|//)")
+ATX_HEADING_RE = re.compile(r"^ {0,3}#{1,6}(?:\s+(.*?))?(?:\s+#+)?\s*$")
+SETEXT_RULE_RE = re.compile(r"^ {0,3}(?:=+|-+)\s*$")
+HEADING_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+HEADING_EMPHASIS_RE = re.compile(r"(?<!\w)_+|_+(?!\w)")
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+# (start, end, target, is_image) for each reference on a line.
+LineRefs = Tuple[Tuple[int, int, str, bool], ...]
+# (mtime_ns, size) of a file, or (-1, mtime_ns of its directory) if missing.
+Stamp = Tuple[int, int]
+
+
+class LinkIssue(NamedTuple):
+    row: int
+    start: int
+    end: int
+    target: str
+    problem: str
+
+
+def heading_slugs(lines: List[str]) -> FrozenSet[str]:
+    """Anchors the preview generates for the headings of a document.
+
+    Uses the same slug rules as the Markdown widget's goto_anchor, applied to
+    heading text with inline link and emphasis markup removed.
+    """
+    slugs = TrackedSlugs()
+    anchors: Set[str] = set()
+    in_fence = False
+    previous = ""
+    for line in lines:
+        if is_fence_line(line):
+            in_fence = not in_fence
+            previous = ""
+            continue
+        if in_fence:
+            continue
+        title: Optional[str] = None
+        match = ATX_HEADING_RE.match(line)
+        if match:
+            title = match.group(1) or ""
+        elif previous.strip() and SETEXT_RULE_RE.match(line):
+            title = previous.strip()
+        if title is not None:
+            title = HEADING_LINK_RE.sub(r"\1", title)
+            title = HEADING_EMPHASIS_RE.sub("", title)
+            anchors.add(unquote(slugs.slug(title)))
+            previous = ""
+        else:
+            previous = line
+    return frozenset(anchors)
+
+
+class LinkValidator:
+    """Finds local links, images and heading anchors that do not resolve.
+
+    References are extracted per line and cached by line text, so checking
+    an edited document only re-scans lines that changed. Each resolved
+    target's outcome is cached together with the stamp of the file it
+    points at; a later check costs one stat per target, and headings of
+    other notes are only re-read once that note's mtime or size changes.
+    """
+
+    def __init__(self, max_cache_entries: int = 20000) -> None:
+        self.max_cache_entries = max_cache_entries
+        self._lines: Dict[str, LineRefs] = {}
+        self._results: Dict[Tuple[str, str], Tuple[Stamp, Optional[str]]] = {}
+        self._headings: Dict[str, Tuple[Stamp, FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cached_targets(self) -> int:
+        """Number of targets whose outcome is cached."""
+        return len(self._results)
+
+    def references(self, line: str) -> LineRefs:
+        """Link and image targets on one line, outside code spans."""
+        cached = self._lines.get(line)
+        if cached is not None:
+            return cached
+
+        code = [match.span() for match in CODE_SPAN_RE.finditer(line)]
+        refs: List[Tuple[int, int, str, bool]] = []
+        for match in INLINE_LINK_RE.finditer(line):
+            if not any(s <= match.start() < e for s, e in code):
+                start, end = match.span(2)
+                refs.append((start, end, match.group(2), bool(match.group(1))))
+        reference = REFERENCE_RE.match(line)
+        if reference:
+            start, end = reference.span(1)
+            refs.append((start, end, reference.group(1), False))
+        for match in HTML_IMAGE_RE.finditer(line):
+            if not any(s <= match.start() < e for s, e in code):
+                start, end = match.span(1)
+                refs.append((start, end, match.group(1), True))
+
+        result = tuple(refs)
+        if len(self._lines) >= self.max_cache_entries:
+            self._lines.clear()
+        self._lines[line] = result
+        return result
+
+    def check(self, text: str, base_dir: Path) -> List[LinkIssue]:
+        """Check every local link and image of a Markdown document.
+
+        Args:
+            text: The document.
+            base_dir: Directory relative targets are resolved against.
+        """
+        lines = text.split("\n")
+        base = str(base_dir)
+        own_anchors: Optional[FrozenSet[str]] = None
+        # Outcomes for this pass; a target repeated on many lines is checked once.
+        checked: Dict[Tuple[str, bool], Optional[str]] = {}
+        issues: List[LinkIssue] = []
+        in_fence = False
+        for row, line in enumerate(lines):
+            if is_fence_line(line):
+                in_fence = not in_fence
+                continue
+            if (
+                in_fence
+                or len(line) > LONG_LINE_LIMIT
+                or not MAYBE_LINK_RE.search(line)
+            ):
+                continue
+            for start, end, raw, is_image in self.references(line):
+                target = raw[1:-1] if raw.startswith("<") else raw
+                if not target or SCHEME_RE.match(target):
+                    continue
+                if target.startswith("#"):
+                    if own_anchors is None:
+                        own_anchors = heading_slugs(lines)
+                    if unquote(target[1:]) not in own_anchors:
+                        issues.append(
+                            LinkIssue(row, start, end, target, "no such heading")
+                        )
+                    continue
+                if (target, is_image) in checked:
+                    problem = checked[target, is_image]
+                else:
+                    problem = checked[target, is_image] = self._check_target(
+                        target, is_image, base
+                    )
+                if problem:
+                    issues.append(LinkIssue(row, start, end, target, problem))
+        return issues
+
+    def _check_target(self, target: str, is_image: bool, base: str) -> Optional[str]:
+        location, _, anchor = target.partition("#")
+        location = unquote(location.split("?", 1)[0])
+        path = os.path.normpath(os.path.join(base, location))
+        stamp = self._stamp(path)
+
+        key = (path, f"{anchor}|{is_image}")
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        problem: Optional[str] = None
+        if stamp[0] < 0:
+            problem = "missing image" if is_image else "missing file"
+        elif anchor and path.lower().endswith(MARKDOWN_SUFFIXES):
+            if unquote(anchor) not in self._anchors_of(path, stamp):
+                problem = f"no such heading in {os.path.basename(path)}"
+        with self._lock:
+            if len(self._results) >= self.max_cache_entries:
+                self._results.clear()
+            self._results[key] = (stamp, problem)
+        return problem
+
+    @staticmethod
+    def _stamp(path: str) -> Stamp:
+        try:
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        # A missing file can only appear by changing its directory.
+        try:
+            return (-1, os.stat(os.path.dirname(path)).st_mtime_ns)
+        except OSError:
+            return (-1, -1)
+
+    def _anchors_of(self, path: str, stamp: Stamp) -> FrozenSet[str]:
+        with self._lock:
+            cached = self._headings.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                anchors = heading_slugs(f.read().split("\n"))
+        except OSError:
+            anchors = frozenset()
+        with self._lock:
+            self._headings[path] = (stamp, anchors)
+        return anchors
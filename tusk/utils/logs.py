@@ -0,0 +1,123 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+LOG_DIR = Path.home() / ".tusk" / "logs"
+LOG_FILE = LOG_DIR / "tusk.log"
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOGGER_NAME = "tusk"
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """Passes each message template at most once per interval.
+
+    Records are grouped by logger, level and unformatted message, so
+    "Autosaved content to %s" is one message type however many files are
+    saved. The first record after a quiet period notes how many were dropped.
+    """
+
+    def __init__(self, interval: float = 10.0, error_interval: float = 1.0) -> None:
+        super().__init__()
+        self.interval = interval
+        self.error_interval = error_interval
+        self._last: Dict[Tuple[str, int, str], Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        interval = (
+            self.error_interval if record.levelno >= logging.WARNING else self.interval
+        )
+        if interval <= 0:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            last_time, suppressed = self._last.get(key, (0.0, 0))
+            if last_time and now - last_time < interval:
+                self._last[key] = (last_time, suppressed + 1)
+                return False
+            self._last[key] = (now, 0)
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar suppressed)"
+        return True
+
+
+def _resolve_level(level: Optional[str]) -> int:
+    name = (level or os.environ.get("TUSK_LOG_LEVEL") or "INFO").upper()
+    resolved = logging.getLevelName(name)
+    return resolved if isinstance(resolved, int) else logging.INFO
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    *,
+    log_file: Path = LOG_FILE,
+    max_bytes: int = 1_000_000,
+    backup_count: int = 3,
+    rate_limit: float = 10.0,
+) -> logging.Logger:
+    """Route the "tusk" logger through a queue to a rotating file.
+
+    Callers only pay for a queue put; formatting and disk writes happen on
+    the listener thread. Calling this again only updates the level, and
+    only if one is given.
+
+    Args:
+        level: Level name; defaults to $TUSK_LOG_LEVEL, then INFO.
+        log_file: Destination of the rotating log.
+        max_bytes: Size at which the log is rotated.
+        backup_count: Number of rotated logs to keep.
+        rate_limit: Seconds between repeats of one message type (0 disables).
+
+    Returns:
+        The configured "tusk" logger.
+    """
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    with _setup_lock:
+        if _listener is not None:
+            if level is not None:
+                logger.setLevel(_resolve_level(level))
+            return logger
+        logger.setLevel(_resolve_level(level))
+
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        queue_handler = QueueHandler(records)
+        queue_handler.addFilter(RateLimitFilter(interval=rate_limit))
+
+        logger.handlers.clear()
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+
+        _listener = QueueListener(records, file_handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        logging.getLogger(LOGGER_NAME).handlers.clear()
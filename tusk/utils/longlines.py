@@ -0,0 +1,50 @@
+import re
+
+# Lines longer than this are generated data (base64 images, minified tables)
+# rather than prose; line-local features skip or truncate them.
+LONG_LINE_LIMIT = 10_000
+ELISION_KEEP = 2_000
+
+_WHITESPACE_RE = re.compile(r"\s")
+_SCAN_WINDOW = 4096
+
+
+def has_long_lines(text: str, limit: int = LONG_LINE_LIMIT) -> bool:
+    """Return True if any line of text is longer than limit."""
+    if len(text) <= limit:
+        return False
+    return max(map(len, text.split("\n"))) > limit
+
+
+def elide_long_lines(
+    text: str, limit: int = LONG_LINE_LIMIT, keep: int = ELISION_KEEP
+) -> str:
+    """Shorten lines longer than limit, keeping line numbers intact.
+
+    Each long line keeps its first keep characters followed by a note of how
+    much was left out, so the preview never lays out megabytes of one line.
+    """
+    if not has_long_lines(text, limit):
+        return text
+    lines = text.split("\n")
+    for index, line in enumerate(lines):
+        if len(line) > limit:
+            lines[index] = f"{line[:keep]} … [{len(line) - keep:,} characters elided]"
+    return "\n".join(lines)
+
+
+def word_start(text: str, index: int) -> int:
+    """Offset where the run of non-whitespace ending at index begins."""
+    while index > 0:
+        low = max(0, index - _SCAN_WINDOW)
+        match = _WHITESPACE_RE.search(text[low:index][::-1])
+        if match:
+            return index - match.start()
+        index = low
+    return 0
+
+
+def word_end(text: str, index: int) -> int:
+    """Offset of the first whitespace character at or after index."""
+    match = _WHITESPACE_RE.search(text, index)
+    return match.start() if match else len(text)
@@ -0,0 +1,214 @@
+import gc
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from tusk.utils.logs import LOG_DIR
+
+# Allocation sites and object types are attributed to the first rule whose
+# fragment appears in the file path (tracemalloc) or module path (objects).
+# More specific rules come first; anything inside Textual but not claimed by
+# a Tusk subsystem is counted as "textual".
+SUBSYSTEM_RULES: Tuple[Tuple[str, str], ...] = (
+    ("/tusk/utils/preview", "preview"),
+    ("/tusk/utils/parse", "preview"),
+    ("/tusk/utils/tables", "preview"),
+    ("/textual/widgets/_markdown", "preview"),
+    ("/markdown_it/", "preview"),
+    ("/tusk/utils/highlight", "highlight cache"),
+    ("/pygments/", "highlight cache"),
+    ("/vim_engine/", "vim engine"),
+    ("/tusk/utils/logs", "logging"),
+    ("/logging/", "logging"),
+    ("/tusk/utils/changes", "change bus"),
+    ("/tusk/utils/spellcheck", "spell check"),
+    ("/tusk/utils/history", "version history"),
+    ("/tusk/utils/frontmatter", "note index"),
+    ("/tusk/utils/links", "link check"),
+    ("/tusk/utils/save", "autosave"),
+    ("/tusk/utils/drafts", "drafts"),
+    ("/tusk/utils/session", "sessions"),
+    ("/tusk/app", "app"),
+    ("/textual/", "textual"),
+    ("/rich/", "textual"),
+)
+OTHER = "other"
+
+
+def subsystem_for(location: str) -> Optional[str]:
+    """Return the subsystem owning a file path, if any."""
+    location = location.replace(os.sep, "/")
+    for fragment, subsystem in SUBSYSTEM_RULES:
+        if fragment in location:
+            return subsystem
+    return None
+
+
+def _resident_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class MemorySample(NamedTuple):
+    time: float
+    rss: int
+    traced: int
+    traced_peak: int
+    # Bytes of live allocations per subsystem, from tracemalloc.
+    allocated: Dict[str, int]
+    # Live container objects per subsystem, from gc.
+    objects: Dict[str, int]
+    # Values reported by the app: cached text sizes, widget counts, ...
+    probes: Dict[str, int]
+
+
+class MemoryMonitor:
+    """Opt-in memory accounting grouped by Tusk subsystem.
+
+    Each sample takes a tracemalloc snapshot and attributes every live
+    allocation to the innermost frame that belongs to a known subsystem,
+    counts gc-tracked objects by the module of their type, and records
+    probe values supplied by the app. Keeping a bounded history of samples
+    makes slow growth over a multi-hour session visible as a trend.
+    """
+
+    def __init__(
+        self,
+        *,
+        frames: int = 16,
+        max_samples: int = 240,
+        dump_dir: Path = LOG_DIR,
+    ) -> None:
+        self.frames = frames
+        self.dump_dir = dump_dir
+        self.samples: Deque[MemorySample] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._top: List[Tuple[str, int, int]] = []
+
+    @property
+    def active(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def sample(self, probes: Optional[Dict[str, int]] = None) -> MemorySample:
+        """Take one sample. Slow (a snapshot walk); call from a worker thread."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        allocated: Counter = Counter()
+        sites: Counter = Counter()
+        for trace in snapshot.traces:
+            owner = OTHER
+            for frame in reversed(trace.traceback):
+                subsystem = subsystem_for(frame.filename)
+                if subsystem is not None and subsystem != "textual":
+                    owner = subsystem
+                    break
+                if subsystem == "textual" and owner == OTHER:
+                    owner = subsystem
+            allocated[owner] += trace.size
+            innermost = trace.traceback[-1]
+            sites[(innermost.filename, innermost.lineno)] += trace.size
+
+        objects: Counter = Counter()
+        for obj in gc.get_objects():
+            module = type(obj).__module__ or ""
+            location = "/" + module.replace(".", "/") + "/"
+            objects[subsystem_for(location) or OTHER] += 1
+
+        traced, peak = tracemalloc.get_traced_memory()
+        sample = MemorySample(
+            time=time.time(),
+            rss=_resident_bytes(),
+            traced=traced,
+            traced_peak=peak,
+            allocated=dict(allocated),
+            objects=dict(objects),
+            probes=dict(probes or {}),
+        )
+        with self._lock:
+            self.samples.append(sample)
+            self._top = [
+                (filename, lineno, size)
+                for (filename, lineno), size in sites.most_common(15)
+            ]
+        return sample
+
+    def report(self) -> str:
+        """Render the latest sample and growth since the first one as text."""
+        with self._lock:
+            samples = list(self.samples)
+            top = list(self._top)
+        if not samples:
+            return "No memory samples yet."
+        first, last = samples[0], samples[-1]
+        elapsed = (last.time - first.time) / 60
+
+        def kib(size: int) -> str:
+            return f"{size / 1024:,.0f} KiB"
+
+        def growth(now: int, then: int, unit: Callable[[int], str]) -> str:
+            delta = now - then
+            return f"{unit(now):>14}  {'+' if delta >= 0 else '-'}{unit(abs(delta))}"
+
+        lines = [
+            f"Samples: {len(samples)} over {elapsed:.1f} min",
+            f"RSS:     {growth(last.rss, first.rss, kib)}",
+            f"Traced:  {growth(last.traced, first.traced, kib)}"
+            f"  (peak {kib(last.traced_peak)})",
+            "",
+            "Allocated by subsystem (now, change since first sample):",
+        ]
+        for name, size in sorted(last.allocated.items(), key=lambda i: -i[1]):
+            lines.append(
+                f"  {name:<16}{growth(size, first.allocated.get(name, 0), kib)}"
+            )
+        lines += ["", "Objects by subsystem:"]
+        for name, count in sorted(last.objects.items(), key=lambda i: -i[1]):
+            lines.append(
+                f"  {name:<16}{growth(count, first.objects.get(name, 0), str)}"
+            )
+        if last.probes:
+            lines += ["", "Probes:"]
+            for name, value in last.probes.items():
+                lines.append(
+                    f"  {name:<24}{growth(value, first.probes.get(name, value), str)}"
+                )
+        if top:
+            lines += ["", "Largest allocation sites:"]
+            for filename, lineno, size in top:
+                lines.append(f"  {kib(size):>12}  {filename}:{lineno}")
+        return "\n".join(lines)
+
+    def dump(self, path: Optional[Path] = None) -> Path:
+        """Write every sample and the largest allocation sites as JSON."""
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = self.dump_dir / f"memory-{stamp}.json"
+        with self._lock:
+            data = {
+                "samples": [sample._asdict() for sample in self.samples],
+                "top_sites": [
+                    {"file": filename, "line": lineno, "size": size}
+                    for filename, lineno, size in self._top
+                ],
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        return path
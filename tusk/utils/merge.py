@@ -0,0 +1,98 @@
+from difflib import SequenceMatcher
+from typing import List, Tuple
+
+Hunk = Tuple[int, int, List[str]]
+
+
+def _hunks(base: List[str], other: List[str]) -> List[Hunk]:
+    """Return (base_start, base_end, replacement) for every change in other."""
+    matcher = SequenceMatcher(None, base, other, autojunk=False)
+    return [
+        (i1, i2, other[j1:j2])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _apply(base: List[str], start: int, end: int, hunks: List[Hunk]) -> List[str]:
+    """Apply hunks to base[start:end]."""
+    out: List[str] = []
+    position = start
+    for hunk_start, hunk_end, lines in hunks:
+        out.extend(base[position:hunk_start])
+        out.extend(lines)
+        position = hunk_end
+    out.extend(base[position:end])
+    return out
+
+
+def merge_texts(base: str, mine: str, theirs: str) -> Tuple[str, bool]:
+    """Three-way merge of two edited versions of base, line by line.
+
+    Non-overlapping changes from both sides are combined. Overlapping changes
+    that differ are kept side by side between conflict markers.
+
+    Returns:
+        The merged text and whether any conflicts were written.
+    """
+    base_lines = base.splitlines(keepends=True)
+    mine_lines = mine.splitlines(keepends=True)
+    theirs_lines = theirs.splitlines(keepends=True)
+    mine_hunks = _hunks(base_lines, mine_lines)
+    theirs_hunks = _hunks(base_lines, theirs_lines)
+
+    merged: List[str] = []
+    conflicts = False
+    position = 0
+    i = j = 0
+    while i < len(mine_hunks) or j < len(theirs_hunks):
+        take_mine = j >= len(theirs_hunks) or (
+            i < len(mine_hunks) and mine_hunks[i][0] <= theirs_hunks[j][0]
+        )
+        first = mine_hunks[i] if take_mine else theirs_hunks[j]
+        start, end = first[0], first[1]
+        group_mine: List[Hunk] = []
+        group_theirs: List[Hunk] = []
+
+        # Collect every hunk from either side that overlaps the region.
+        while True:
+            if i < len(mine_hunks) and (
+                mine_hunks[i][0] < end or mine_hunks[i][0] == start
+            ):
+                group_mine.append(mine_hunks[i])
+                end = max(end, mine_hunks[i][1])
+                i += 1
+            elif j < len(theirs_hunks) and (
+                theirs_hunks[j][0] < end or theirs_hunks[j][0] == start
+            ):
+                group_theirs.append(theirs_hunks[j])
+                end = max(end, theirs_hunks[j][1])
+                j += 1
+            else:
+                break
+
+        merged.extend(base_lines[position:start])
+        mine_region = _apply(base_lines, start, end, group_mine)
+        theirs_region = _apply(base_lines, start, end, group_theirs)
+        if not group_theirs:
+            merged.extend(mine_region)
+        elif not group_mine or mine_region == theirs_region:
+            merged.extend(theirs_region)
+        else:
+            conflicts = True
+            merged.append("<<<<<<< editor\n")
+            merged.extend(_terminated(mine_region))
+            merged.append("=======\n")
+            merged.extend(_terminated(theirs_region))
+            merged.append(">>>>>>> disk\n")
+        position = end
+
+    merged.extend(base_lines[position:])
+    return "".join(merged), conflicts
+
+
+def _terminated(lines: List[str]) -> List[str]:
+    """Make sure the last line ends with a newline before a conflict marker."""
+    if lines and not lines[-1].endswith("\n"):
+        return lines[:-1] + [lines[-1] + "\n"]
+    return lines
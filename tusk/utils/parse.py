@@ -0,0 +1,79 @@
+import hashlib
+from typing import Callable, List, NamedTuple, Optional
+
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+
+from tusk.utils.longlines import elide_long_lines
+
+
+class ParsedBlock(NamedTuple):
+    """A top-level Markdown block and the tokens that build it."""
+
+    start: int
+    end: int
+    digest: str
+    tokens: List[Token]
+
+
+class ParsedDocument(NamedTuple):
+    """The block representation of one version of a document."""
+
+    version: int
+    line_count: int
+    blocks: List[ParsedBlock]
+
+
+def _default_parser() -> MarkdownIt:
+    return MarkdownIt("gfm-like")
+
+
+def parse_document(
+    source: str,
+    version: int,
+    parser_factory: Optional[Callable[[], MarkdownIt]] = None,
+) -> ParsedDocument:
+    """Tokenize source and split the token stream into top-level blocks.
+
+    This does no widget work, so it is safe to run in a worker thread. Each
+    block carries a digest of its source lines, which lets the preview keep
+    widgets for blocks that did not change. Pathologically long lines are
+    elided first (line numbers are kept), so a base64 image or a generated
+    one-line table cannot stall tokenizing or layout.
+
+    Args:
+        source: The Markdown document.
+        version: The document version this parse belongs to.
+        parser_factory: Optional factory for a configured MarkdownIt.
+
+    Returns:
+        The parsed document.
+    """
+    source = elide_long_lines(source)
+    parser = (parser_factory or _default_parser)()
+    tokens = parser.parse(source)
+    lines = source.splitlines(keepends=True)
+
+    blocks: List[ParsedBlock] = []
+    group: List[Token] = []
+    depth = 0
+    for token in tokens:
+        group.append(token)
+        depth += token.nesting
+        if depth > 0:
+            continue
+        opener = group[0]
+        if opener.map is not None:
+            start, end = opener.map
+            body = "".join(lines[start:end])
+        else:
+            start = end = blocks[-1].end if blocks else 0
+            body = opener.content
+        digest = hashlib.blake2b(
+            f"{opener.type}\0{body}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        blocks.append(ParsedBlock(start, end, digest, group))
+        group = []
+        depth = 0
+
+    return ParsedDocument(version, len(lines), blocks)
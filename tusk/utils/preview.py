@@ -0,0 +1,396 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from markdown_it.token import Token
+from textual import work
+from textual.app import ComposeResult
+from textual.await_complete import AwaitComplete
+from textual.content import Content
+from textual.dom import DOMNode
+from textual.widget import Widget
+from textual.widgets import Markdown
+from textual.widgets._markdown import MarkdownTable
+from textual.widgets.markdown import MarkdownBlock, MarkdownFence
+
+from tusk.utils.highlight import HighlightCache
+from tusk.utils.parse import ParsedDocument, parse_document
+from tusk.utils.sourcemap import SourceMap, SourceSpan
+from tusk.utils.tables import TableView
+
+
+class RenderedBlock(NamedTuple):
+    """A mounted top-level block and the parse it came from."""
+
+    digest: str
+    start: int
+    end: int
+    widget: Optional[MarkdownBlock]
+
+
+class LazyFence(MarkdownFence):
+    """A fenced code block that shows plain text until its highlight is ready."""
+
+    @classmethod
+    def highlight(cls, code: str, language: str) -> Content:
+        # Highlighting happens in the preview's worker; start out plain.
+        return Content(code)
+
+    def __init__(self, markdown: "PreviewMarkdown", token: Token, code: str) -> None:
+        super().__init__(markdown, token, code)
+        self.highlighted = False
+        cache: Optional[HighlightCache] = getattr(markdown, "highlight_cache", None)
+        theme = getattr(markdown, "highlight_theme", "")
+        if cache is not None:
+            cached = cache.get(HighlightCache.key(self.code, self.lexer, theme))
+            if cached is not None:
+                self._highlighted_code = cached
+                self.highlighted = True
+
+    def on_mount(self) -> None:
+        if not self.highlighted and isinstance(self._markdown, PreviewMarkdown):
+            self._markdown.request_highlight(self)
+
+
+class VirtualTable(MarkdownTable):
+    """A table that switches to a line-rendered TableView once it is large.
+
+    Small tables keep Textual's grid of cell widgets. Large ones are built
+    straight from tokens, without a widget per row and cell, and drawn by a
+    single TableView, which renders only visible rows and can be updated in
+    place when an edit changes a few rows.
+    """
+
+    VIRTUALIZE_ROWS = 50
+
+    _prebuilt: Optional[Tuple[List[Content], List[List[Content]]]] = None
+    _row_sources: Optional[List[Tuple[str, ...]]] = None
+
+    @classmethod
+    def from_tokens(
+        cls, markdown: "PreviewMarkdown", tokens: List[Token]
+    ) -> "VirtualTable":
+        """Build a table whose rows are read from tokens, not child blocks.
+
+        Cell contents are cached by their source text on the preview, so
+        rebuilding a table after an edit only converts the cells that changed.
+        """
+        table = cls(markdown, tokens[0])
+        cells = markdown.table_cell_cache
+        if len(cells) > markdown.MAX_TABLE_CELLS:
+            cells.clear()
+        headers: List[Content] = []
+        rows: List[List[Content]] = []
+        sources: List[List[str]] = []
+        in_header = False
+        for token in tokens:
+            if token.type == "thead_open":
+                in_header = True
+            elif token.type == "thead_close":
+                in_header = False
+            elif token.type == "tr_open" and not in_header:
+                rows.append([])
+                sources.append([])
+            elif token.type == "inline":
+                content = cells.get(token.content)
+                if content is None:
+                    content = cells[token.content] = table._token_to_content(token)
+                if in_header:
+                    headers.append(content)
+                elif rows:
+                    rows[-1].append(content)
+                    sources[-1].append(token.content)
+        table._prebuilt = (headers, rows)
+        table._row_sources = [tuple(source) for source in sources]
+        return table
+
+    @staticmethod
+    def row_count(tokens: List[Token]) -> int:
+        return sum(1 for token in tokens if token.type == "tr_open") - 1
+
+    @property
+    def virtualized(self) -> bool:
+        return len(self._rows) >= self.VIRTUALIZE_ROWS
+
+    def _get_headers_and_rows(self) -> Tuple[List[Content], List[List[Content]]]:
+        if self._prebuilt is not None:
+            return self._prebuilt
+        return super()._get_headers_and_rows()
+
+    def compose(self) -> ComposeResult:
+        self._headers, self._rows = self._get_headers_and_rows()
+        if self.virtualized:
+            yield TableView(self._headers, self._rows, keys=self._row_sources)
+        else:
+            yield from super().compose()
+
+    def update_table(self, block: "VirtualTable") -> bool:
+        """Take the rows of a freshly parsed table without remounting.
+
+        Returns:
+            False if either table is not virtualized and a remount is needed.
+        """
+        headers, rows = block._get_headers_and_rows()
+        if not self.virtualized or len(rows) < self.VIRTUALIZE_ROWS:
+            return False
+        self.query_one(TableView).set_rows(headers, rows, keys=block._row_sources)
+        self._headers, self._rows = headers, rows
+        self._token = block._token
+        return True
+
+
+class PreviewMarkdown(Markdown):
+    """Markdown preview that keeps parsing and highlighting off the event loop.
+
+    Each update is tokenized in a worker thread into top-level blocks tagged
+    with a version number. Results for superseded versions are dropped, and
+    only blocks whose source changed are rebuilt and remounted on the UI
+    thread.
+
+    Fences are built with plain text and queued for a background worker,
+    which highlights the blocks nearest the viewport first. Highlights are
+    cached by (language, block hash, theme) so unchanged blocks are free on
+    every later update.
+
+    A source map from editor lines to top-level blocks is spliced alongside
+    each remount, so the preview can follow the editor with a bisect.
+    """
+
+    DEFAULT_CSS = """
+    PreviewMarkdown .-broken-links {
+        border-left: outer $error;
+    }
+    """
+
+    BLOCKS = {
+        **Markdown.BLOCKS,
+        "fence": LazyFence,
+        "code_block": LazyFence,
+        "table_open": VirtualTable,
+    }
+
+    MAX_TABLE_CELLS = 200_000
+
+    def __init__(
+        self,
+        markdown: Optional[str] = None,
+        *,
+        highlight_cache: Optional[HighlightCache] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(markdown, **kwargs)
+        self.highlight_cache = highlight_cache or HighlightCache()
+        self.highlight_theme = ""
+        self._pending_fences: List[LazyFence] = []
+        self._version = 0
+        self._rendered: List[RenderedBlock] = []
+        self._rendered_theme = ""
+        self._rendered_line_count = 0
+        self.source_map = SourceMap()
+        self._parse_lock = asyncio.Lock()
+        self.last_mount_time = 0.0
+        self.table_cell_cache: Dict[str, Content] = {}
+        self._link_problems: Dict[int, List[str]] = {}
+
+    @property
+    def version(self) -> int:
+        """Version of the most recently requested document."""
+        return self._version
+
+    def update(self, markdown: str) -> AwaitComplete:
+        """Parse markdown in a worker thread and mount the blocks that changed."""
+        self.highlight_theme = self.app.theme
+        self._version += 1
+        version = self._version
+        self._markdown = markdown
+        self._table_of_contents = None
+
+        async def await_update() -> None:
+            # Queued parses for versions that were superseded while waiting
+            # for the lock are skipped rather than run.
+            async with self._parse_lock:
+                if version != self._version:
+                    return
+                parsed = await asyncio.get_running_loop().run_in_executor(
+                    None, parse_document, markdown, version, self._parser_factory
+                )
+            if parsed.version != self._version:
+                return
+            async with self.lock:
+                if parsed.version != self._version:
+                    return
+                started = time.perf_counter()
+                await self._mount_parsed(parsed)
+                self.last_mount_time = time.perf_counter() - started
+            self.post_message(
+                Markdown.TableOfContentsUpdated(
+                    self, self.table_of_contents
+                ).set_sender(self)
+            )
+
+        return AwaitComplete(await_update())
+
+    async def _mount_parsed(self, parsed: ParsedDocument) -> None:
+        """Replace only the rendered blocks that differ from the new parse."""
+        old = self._rendered
+        if self._rendered_theme != self.highlight_theme:
+            old = []
+            self.source_map.clear()
+            self._rendered_line_count = 0
+        new = parsed.blocks
+
+        prefix = 0
+        limit = min(len(old), len(new))
+        while prefix < limit and old[prefix].digest == new[prefix].digest:
+            prefix += 1
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and old[-1 - suffix].digest == new[-1 - suffix].digest:
+            suffix += 1
+
+        removed = [
+            block.widget
+            for block in old[prefix : len(old) - suffix]
+            if block.widget is not None
+        ]
+        if not old:
+            removed = list(self.query_children(MarkdownBlock))
+
+        added: List[RenderedBlock] = []
+        for block in new[prefix : len(new) - suffix]:
+            widget = self._build_block(block.tokens)
+            added.append(RenderedBlock(block.digest, block.start, block.end, widget))
+
+        # Editing inside a large table changes one block; update its rows in
+        # place rather than rebuilding and remounting the whole table.
+        if (
+            len(removed) == 1
+            and len(added) == 1
+            and isinstance(removed[0], VirtualTable)
+            and isinstance(added[0].widget, VirtualTable)
+            and removed[0].is_mounted
+            and removed[0].update_table(added[0].widget)
+        ):
+            table = removed[0]
+            table.source_range = (added[0].start, added[0].end)
+            added[0] = added[0]._replace(widget=table)
+            removed = []
+
+        kept: List[RenderedBlock] = []
+        for rendered, block in zip(old[len(old) - suffix :], new[len(new) - suffix :]):
+            if rendered.widget is not None:
+                rendered.widget.source_range = (block.start, block.end)
+            kept.append(
+                RenderedBlock(block.digest, block.start, block.end, rendered.widget)
+            )
+
+        anchor = next((block.widget for block in kept if block.widget), None)
+        widgets = [
+            block.widget
+            for block in added
+            if block.widget is not None and not block.widget.is_mounted
+        ]
+        with self.app.batch_update():
+            if removed:
+                await self.remove_children(removed)
+            if widgets:
+                if anchor is not None:
+                    await self.mount_all(widgets, before=anchor)
+                else:
+                    await self.mount_all(widgets)
+
+        self.source_map.splice(
+            prefix,
+            len(old) - prefix - suffix,
+            [SourceSpan(block.start, block.end, block.widget) for block in added],
+            parsed.line_count - self._rendered_line_count,
+        )
+        self._rendered = old[:prefix] + added + kept
+        self._rendered_theme = self.highlight_theme
+        self._rendered_line_count = parsed.line_count
+        self._last_parsed_line = parsed.line_count
+        if self._link_problems:
+            self._mark_link_problems(added)
+
+    def _build_block(self, tokens: List[Token]) -> Optional[MarkdownBlock]:
+        """Create the widget for one top-level block."""
+        if (
+            tokens
+            and tokens[0].type == "table_open"
+            and VirtualTable.row_count(tokens) >= VirtualTable.VIRTUALIZE_ROWS
+        ):
+            return VirtualTable.from_tokens(self, tokens)
+        widgets = list(self._parse_markdown(tokens))
+        return widgets[0] if widgets else None
+
+    def set_link_problems(self, problems: Dict[int, List[str]]) -> None:
+        """Flag blocks holding broken links, given messages per source line."""
+        self._link_problems = problems
+        self._mark_link_problems(self._rendered)
+
+    def _mark_link_problems(self, blocks: List[RenderedBlock]) -> None:
+        rows = sorted(self._link_problems)
+        for block in blocks:
+            widget = block.widget
+            if widget is None:
+                continue
+            first = bisect_left(rows, block.start)
+            last = bisect_left(rows, max(block.end, block.start + 1))
+            messages = [
+                message
+                for row in rows[first:last]
+                for message in self._link_problems[row]
+            ]
+            if messages or widget.has_class("-broken-links"):
+                widget.set_class(bool(messages), "-broken-links")
+                widget.tooltip = "\n".join(messages) if messages else None
+
+    def scroll_to_source_line(self, line: int, *, animate: bool = False) -> None:
+        """Scroll so the block rendered from an editor line is at the top."""
+        span = self.source_map.lookup(line)
+        if span is None or span.target is None or not span.target.is_attached:
+            return
+        region = span.target.virtual_region
+        offset = region.y
+        if span.end > span.start and line > span.start:
+            fraction = min(1.0, (line - span.start) / (span.end - span.start))
+            offset += int(region.height * fraction)
+        self.scroll_to(y=offset, animate=animate, immediate=not animate)
+
+    def request_highlight(self, fence: LazyFence) -> None:
+        """Queue a mounted fence for background highlighting."""
+        self._pending_fences.append(fence)
+        if len(self._pending_fences) == 1:
+            self.call_after_refresh(self._highlight_pending)
+
+    def _viewport_distance(self, fence: LazyFence) -> int:
+        """Rows between a fence and the visible part of the preview."""
+        offset = 0
+        node: Optional[DOMNode] = fence
+        while isinstance(node, Widget) and node is not self:
+            offset += node.virtual_region.y
+            node = node.parent
+        top = self.scroll_offset.y
+        bottom = top + self.size.height
+        end = offset + fence.outer_size.height
+        if end < top:
+            return top - end
+        if offset > bottom:
+            return offset - bottom
+        return 0
+
+    @work(exclusive=True, group="preview-highlight")
+    async def _highlight_pending(self) -> None:
+        theme = self.highlight_theme
+        while self._pending_fences:
+            self._pending_fences.sort(key=self._viewport_distance)
+            fence = self._pending_fences.pop(0)
+            if not fence.is_attached or fence.highlighted:
+                continue
+            content = await asyncio.to_thread(
+                self.highlight_cache.highlight, fence.code, fence.lexer, theme
+            )
+            if fence.is_attached and theme == self.highlight_theme:
+                fence.set_content(content)
+                fence.highlighted = True
@@ -0,0 +1,142 @@
+import gzip
+import json
+import time
+import zlib
+from pathlib import Path
+from typing import IO, Iterator, List, NamedTuple, Optional, Tuple
+
+SESSION_FORMAT_VERSION = 1
+# Seconds between flushes, so a crash loses at most this much of a recording.
+FLUSH_INTERVAL = 1.0
+
+
+class RecordedKey(NamedTuple):
+    offset: float
+    key: str
+    character: Optional[str]
+
+
+class RecordedSession(NamedTuple):
+    initial_text: str
+    file_name: str
+    keys: List[RecordedKey]
+    # False if the recording was cut short, e.g. by a crash.
+    complete: bool = True
+
+
+class SessionRecorder:
+    """Records timestamped key events and the starting document to a file.
+
+    Sessions are gzip-compressed JSON lines: a header with the initial text,
+    then one `[offset_ms, key, character]` array per key event.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stream: Optional[IO[str]] = None
+        self._started = 0.0
+        self._flushed = 0.0
+
+    @property
+    def recording(self) -> bool:
+        return self._stream is not None
+
+    def start(self, initial_text: str, file_name: str = "") -> None:
+        """Open the session file and write the header."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream = gzip.open(self.path, "wt", encoding="utf-8")
+        self._started = time.perf_counter()
+        header = {
+            "version": SESSION_FORMAT_VERSION,
+            "file": file_name,
+            "text": initial_text,
+        }
+        self._stream.write(json.dumps(header) + "\n")
+        self._stream.flush()
+        self._flushed = self._started
+
+    def record_key(self, key: str, character: Optional[str]) -> None:
+        if not self._stream:
+            return
+        now = time.perf_counter()
+        offset_ms = round((now - self._started) * 1000, 1)
+        self._stream.write(json.dumps([offset_ms, key, character]) + "\n")
+        if now - self._flushed >= FLUSH_INTERVAL:
+            # A sync flush ends the compressed data on a byte boundary, so
+            # everything written so far can be read back after a crash.
+            self._stream.flush()
+            self._flushed = now
+
+    def close(self) -> None:
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+
+
+def _iter_lines(path: Path, complete: List[bool]) -> Iterator[str]:
+    """Yield complete lines, stopping quietly where a crash cut the file off.
+
+    complete[0] is set to False if the file ended early.
+    """
+    with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    complete[0] = False
+                    return
+                if line.strip():
+                    yield line
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            complete[0] = False
+
+
+def load_session(path: Path) -> RecordedSession:
+    """Read a session written by SessionRecorder.
+
+    A session from a Tusk that was killed or crashed ends mid-stream; the
+    keys recorded up to that point are returned with complete set to False.
+
+    Raises:
+        ValueError: If the file is not a recorded session.
+    """
+    complete = [True]
+    lines = _iter_lines(path, complete)
+    try:
+        header = json.loads(next(lines))
+    except (StopIteration, json.JSONDecodeError, OSError) as exc:
+        raise ValueError(f"Not a Tusk session file: {path}") from exc
+    if header.get("version") != SESSION_FORMAT_VERSION:
+        raise ValueError(f"Unsupported session version: {header.get('version')}")
+
+    keys: List[RecordedKey] = []
+    for line in lines:
+        try:
+            offset_ms, key, character = json.loads(line)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            # A damaged record; keep the keys read before it.
+            complete[0] = False
+            break
+        keys.append(RecordedKey(offset_ms / 1000, key, character))
+    return RecordedSession(
+        header.get("text", ""), header.get("file", ""), keys, complete[0]
+    )
+
+
+def latency_summary(samples: List[float]) -> List[Tuple[str, float]]:
+    """Summarize latencies (seconds) as (label, milliseconds) pairs."""
+    if not samples:
+        return []
+    ordered = sorted(samples)
+
+    def percentile(fraction: float) -> float:
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    return [
+        ("count", float(len(ordered))),
+        ("mean", sum(ordered) / len(ordered) * 1000),
+        ("p50", percentile(0.50)),
+        ("p90", percentile(0.90)),
+        ("p99", percentile(0.99)),
+        ("max", ordered[-1] * 1000),
+    ]
@@ -1,43 +1,95 @@
-import logging
+import hashlib
 from datetime import datetime
 from pathlib import Path
 
+from tusk.utils.logs import setup_logging
+
+CONFLICT_MESSAGE = "File changed on disk; reload or merge before saving"
+
+
+def content_digest(content: str) -> str:
+    """Hash of text as it is stored on disk."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
 
 class AutoSave:
     """Handles automatic saving of editor content to prevent data loss."""
 
     def __init__(self, file_path: Path | None = None) -> None:
-        log_dir = Path.home() / ".tusk" / "logs"
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-        log_file = log_dir / "tusk.log"
-        logging.basicConfig(
-            filename=str(log_file),
-            level=logging.INFO,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            force=True,
-        )
-        self.logger = logging.getLogger("tusk")
+        self.logger = setup_logging()
         self.file_path = file_path
-        self.last_save_time = None
+        self.last_save_time: datetime | None = None
+        self.conflict = False
+        self.base_content = ""
+        self._disk_stat: tuple[int, int] | None = None
+        self._disk_digest: str | None = None
         self.logger.info("AutoSave initialized")
 
-    def autosave_content(self, content: str) -> tuple[bool, str | None]:
-        """Save the current editor content."""
+    def _remember_disk_state(self, content: str) -> None:
+        """Record what we know is on disk after reading or writing it."""
+        self._disk_stat = None
+        if self.file_path is not None:
+            try:
+                stat = self.file_path.stat()
+                self._disk_stat = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                pass
+        self._disk_digest = content_digest(content)
+        self.base_content = content
+        self.conflict = False
+
+    def check_external_change(self) -> bool:
+        """Return True if another program changed the file since we last touched it.
+
+        Size and mtime are compared first; the file is only read and hashed
+        when they differ, so unchanged files cost a single stat.
+        """
+        if not self.file_path or self._disk_digest is None:
+            return False
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return False
+        current = (stat.st_size, stat.st_mtime_ns)
+        if current == self._disk_stat:
+            return False
+        try:
+            digest = content_digest(self.file_path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            return True
+        if digest == self._disk_digest:
+            self._disk_stat = current
+            return False
+        return True
+
+    def autosave_content(
+        self, content: str, *, force: bool = False
+    ) -> tuple[bool, str | None]:
+        """Save the current editor content.
+
+        Refuses to overwrite the file when it was changed by another program,
+        unless force is set.
+        """
         if not self.file_path:
             warning = "No file path configured; skipping autosave"
             self.logger.warning(warning)
             return False, warning
 
+        if not force and (self.conflict or self.check_external_change()):
+            self.conflict = True
+            self.logger.warning("Refusing to overwrite %s", self.file_path)
+            return False, CONFLICT_MESSAGE
+
         try:
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
             self.file_path.write_text(content, encoding="utf-8")
+            self._remember_disk_state(content)
             self.last_save_time = datetime.now()
-            self.logger.info(f"Autosaved content to {self.file_path}")
+            self.logger.info("Autosaved content to %s", self.file_path)
             return True, None
         except Exception as e:
             message = f"Failed to autosave: {str(e)}"
-            self.logger.error(message)
+            self.logger.error("Failed to autosave: %s", e)
             return False, message
 
     def load_last_save(self) -> str:
@@ -46,9 +98,11 @@ class AutoSave:
             return ""
 
         try:
-            return self.file_path.read_text(encoding="utf-8")
+            content = self.file_path.read_text(encoding="utf-8")
         except FileNotFoundError:
-            return ""
+            content = ""
+        self._remember_disk_state(content)
+        return content
 
     def get_last_save_time(self) -> str:
         if self.last_save_time:
@@ -57,3 +111,6 @@ class AutoSave:
 
     def set_file_path(self, file_path: Path) -> None:
         self.file_path = file_path
+        self._disk_stat = None
+        self._disk_digest = None
+        self.conflict = False
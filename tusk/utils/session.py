@@ -0,0 +1,169 @@
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+SESSION_DIR = Path.home() / ".tusk" / "sessions"
+SESSION_VERSION = 1
+
+SessionState = Dict[str, Any]
+
+
+_UNSUPPORTED = object()
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        items = ((str(key), _json_value(item)) for key, item in value.items())
+        return {key: item for key, item in items if item is not _UNSUPPORTED}
+    if isinstance(value, (list, tuple)):
+        items = (_json_value(item) for item in value)
+        return [item for item in items if item is not _UNSUPPORTED]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return _UNSUPPORTED
+
+
+def json_safe(value: Any) -> Any:
+    """Copy value keeping only what JSON can store; tuples become lists.
+
+    Returns None if value itself cannot be stored.
+    """
+    value = _json_value(value)
+    return None if value is _UNSUPPORTED else value
+
+
+def from_json(value: Any) -> Any:
+    """Undo json_safe's list conversion, turning lists back into tuples."""
+    if isinstance(value, dict):
+        return {key: from_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return tuple(from_json(item) for item in value)
+    return value
+
+
+class SessionStore:
+    """Per-file editor session state, one small JSON file per document.
+
+    Each document's state (cursor, scroll offsets, pane layout, vim
+    registers and marks, folds, preview scroll) lives in a file named by a
+    hash of its path, so opening a note reads exactly one small file no
+    matter how many notes have been edited. Updates are staged in memory
+    and written together by flush, which is meant to run off the UI thread.
+    """
+
+    def __init__(self, session_dir: Path = SESSION_DIR) -> None:
+        self.session_dir = session_dir
+        self._states: Dict[str, SessionState] = {}
+        self._dirty: Dict[str, SessionState] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(path.resolve())
+
+    def _session_file(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.session_dir / f"{digest}.json"
+
+    @property
+    def pending(self) -> bool:
+        """True if staged state has not been written yet."""
+        return bool(self._dirty)
+
+    def load(self, path: Path) -> SessionState:
+        """Return the saved state for path, or an empty dict."""
+        key = self._key(path)
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                return dict(state)
+        try:
+            data = json.loads(self._session_file(key).read_text(encoding="utf-8"))
+            if data.get("version") != SESSION_VERSION or data.get("path") != key:
+                raise ValueError("not a session for this file")
+            state = data["state"]
+            if not isinstance(state, dict):
+                raise ValueError("malformed session state")
+        except (OSError, ValueError, KeyError, AttributeError):
+            state = {}
+        with self._lock:
+            self._states[key] = state
+        return dict(state)
+
+    def update(self, path: Path, changes: SessionState) -> bool:
+        """Stage fields of path's state; returns True if anything changed."""
+        key = self._key(path)
+        state = self._states.get(key)
+        if state is None:
+            state = self.load(path)
+        merged = {**state, **changes}
+        if merged == state:
+            return False
+        with self._lock:
+            self._states[key] = merged
+            self._dirty[key] = merged
+        return True
+
+    def remove(self, path: Path) -> None:
+        """Forget path's state, on disk and staged."""
+        key = self._key(path)
+        with self._lock:
+            self._states.pop(key, None)
+            self._dirty.pop(key, None)
+        try:
+            self._session_file(key).unlink()
+        except OSError:
+            pass
+
+    def flush(self) -> int:
+        """Write every staged state. Returns the number of files written."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return 0
+        written = 0
+        try:
+            self.session_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            pass
+        for key, state in dirty.items():
+            session_file = self._session_file(key)
+            tmp_file = session_file.with_suffix(".tmp")
+            data = {
+                "version": SESSION_VERSION,
+                "path": key,
+                "saved": time.time(),
+                "state": state,
+            }
+            try:
+                encoded = json.dumps(data, separators=(",", ":"))
+            except (TypeError, ValueError):
+                continue
+            try:
+                tmp_file.write_text(encoded, "utf-8")
+                tmp_file.replace(session_file)
+                written += 1
+            except OSError:
+                with self._lock:
+                    self._dirty.setdefault(key, state)
+        return written
+
+    def collect_garbage(self, max_age_days: int = 180) -> int:
+        """Delete sessions not written for max_age_days. Returns the count."""
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        try:
+            entries = list(self.session_dir.glob("*.json"))
+        except OSError:
+            return 0
+        for session_file in entries:
+            try:
+                if session_file.stat().st_mtime < cutoff:
+                    session_file.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
@@ -0,0 +1,69 @@
+from bisect import bisect_right
+from typing import List, NamedTuple, Optional, Sequence
+
+from textual.widget import Widget
+
+
+class SourceSpan(NamedTuple):
+    start: int
+    end: int
+    target: Optional[Widget]
+
+
+class SourceMap:
+    """Sorted map from editor line ranges to rendered preview blocks.
+
+    Entries are kept in document order in parallel lists so a line can be
+    resolved with a single bisect. Edits splice the affected entries in place
+    and shift the ones after them, mirroring how the preview remounts blocks.
+    """
+
+    def __init__(self) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._targets: List[Optional[Widget]] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def clear(self) -> None:
+        self._starts.clear()
+        self._ends.clear()
+        self._targets.clear()
+
+    def splice(
+        self,
+        index: int,
+        count: int,
+        spans: Sequence[SourceSpan],
+        line_delta: int = 0,
+    ) -> None:
+        """Replace count entries at index with spans.
+
+        Args:
+            index: Position of the first replaced entry.
+            count: Number of entries to replace.
+            spans: New entries, in document order.
+            line_delta: Line shift to apply to every entry after the splice.
+        """
+        stop = index + count
+        if line_delta:
+            self._starts[stop:] = [start + line_delta for start in self._starts[stop:]]
+            self._ends[stop:] = [end + line_delta for end in self._ends[stop:]]
+        self._starts[index:stop] = [span.start for span in spans]
+        self._ends[index:stop] = [span.end for span in spans]
+        self._targets[index:stop] = [span.target for span in spans]
+
+    def lookup(self, line: int) -> Optional[SourceSpan]:
+        """Return the block containing line, or the closest block before it."""
+        position = bisect_right(self._starts, line) - 1
+        while position >= 0:
+            target = self._targets[position]
+            if target is not None:
+                return SourceSpan(self._starts[position], self._ends[position], target)
+            position -= 1
+        if self._targets:
+            for index, target in enumerate(self._targets):
+                if target is not None:
+                    return SourceSpan(self._starts[index], self._ends[index], target)
+        return None
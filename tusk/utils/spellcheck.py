@@ -0,0 +1,117 @@
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from tusk.utils.complete import is_fence_line
+from tusk.utils.longlines import LONG_LINE_LIMIT
+
+USER_WORDS_PATH = Path.home() / ".config" / "tusk" / "words.txt"
+SYSTEM_WORD_LISTS = (
+    Path("/usr/share/dict/words"),
+    Path("/usr/share/dict/american-english"),
+    Path("/usr/share/dict/british-english"),
+)
+
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z']*[A-Za-z]|[A-Za-z]")
+# Spans whose words are never checked: inline code, link targets, bare URLs
+# and autolinks.
+SKIP_RE = re.compile(r"`[^`]*`|\]\([^)]*\)|https?://\S+|<[^>\s]+>")
+
+Range = Tuple[int, int]
+
+
+class SpellIssue(NamedTuple):
+    row: int
+    start: int
+    end: int
+    word: str
+
+
+class SpellChecker:
+    """Checks prose lines against a local word list, caching by line.
+
+    Results are cached by line text, so a full pass over an unchanged
+    document is one dictionary lookup per line. Fenced code blocks are skipped using the same
+    fence rule as AutoComplete, and inline code and link targets are ignored.
+    """
+
+    def __init__(
+        self,
+        word_lists: Optional[Iterable[Path]] = None,
+        max_cache_entries: int = 20000,
+    ) -> None:
+        self.word_lists = list(word_lists or SYSTEM_WORD_LISTS) + [USER_WORDS_PATH]
+        self.max_cache_entries = max_cache_entries
+        self.words: Set[str] = set()
+        self._loaded = False
+        self._cache: Dict[str, Tuple[Range, ...]] = {}
+
+    @property
+    def cached_lines(self) -> int:
+        """Number of lines whose results are cached."""
+        return len(self._cache)
+
+    @property
+    def available(self) -> bool:
+        """True once a non-empty word list has been loaded."""
+        return bool(self.words)
+
+    def load(self) -> None:
+        """Read the word lists. Slow on first call; run it off the UI thread."""
+        if self._loaded:
+            return
+        for path in self.word_lists:
+            try:
+                with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                    self.words.update(
+                        line.strip().lower() for line in f if line.strip()
+                    )
+            except OSError:
+                continue
+        self._loaded = True
+
+    def _is_known(self, word: str) -> bool:
+        lowered = word.lower()
+        if lowered in self.words:
+            return True
+        if lowered.endswith("'s") and lowered[:-2] in self.words:
+            return True
+        # Acronyms and single letters are not worth flagging.
+        return len(word) == 1 or word.isupper()
+
+    def check_line(self, line: str) -> Tuple[Range, ...]:
+        """Return the (start, end) columns of misspelled words in a prose line."""
+        cached = self._cache.get(line)
+        if cached is not None:
+            return cached
+
+        skipped = [match.span() for match in SKIP_RE.finditer(line)]
+        ranges: List[Range] = []
+        for match in WORD_RE.finditer(line):
+            start, end = match.span()
+            if any(s <= start < e for s, e in skipped):
+                continue
+            if not self._is_known(match.group()):
+                ranges.append((start, end))
+
+        result = tuple(ranges)
+        if len(self._cache) >= self.max_cache_entries:
+            self._cache.clear()
+        self._cache[line] = result
+        return result
+
+    def check(self, text: str) -> List[SpellIssue]:
+        """Check every prose line of a Markdown document."""
+        if not self.available:
+            return []
+        issues: List[SpellIssue] = []
+        in_fence = False
+        for row, line in enumerate(text.split("\n")):
+            if is_fence_line(line):
+                in_fence = not in_fence
+                continue
+            if in_fence or len(line) > LONG_LINE_LIMIT or not line.strip():
+                continue
+            for start, end in self.check_line(line):
+                issues.append(SpellIssue(row, start, end, line[start:end]))
+        return issues
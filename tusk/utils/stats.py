@@ -0,0 +1,31 @@
+from tusk.utils.changes import ChangeEvent
+from tusk.utils.longlines import word_end, word_start
+
+
+class WordCounter:
+    """Keeps word and character counts current from change deltas.
+
+    Each delta is widened to the surrounding whitespace so words it splits
+    or joins are recounted, making an update cost proportional to the edit.
+    """
+
+    def __init__(self) -> None:
+        self.words = 0
+        self.chars = 0
+
+    def reset(self, text: str) -> None:
+        self.words = len(text.split())
+        self.chars = len(text)
+
+    def apply(self, event: ChangeEvent) -> None:
+        if event.reset:
+            self.reset(event.text)
+            return
+
+        old, new, delta = event.previous, event.text, event.delta
+        start = word_start(old, delta.start)
+        old_end = word_end(old, delta.end)
+        new_end = old_end - len(delta.removed) + len(delta.inserted)
+
+        self.words += len(new[start:new_end].split()) - len(old[start:old_end].split())
+        self.chars = len(new)
@@ -0,0 +1,207 @@
+from collections import Counter, OrderedDict
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+from textual.content import Content
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.style import Style
+
+Row = Sequence[Content]
+RowKey = Tuple[Tuple[str, Tuple[object, ...]], ...]
+
+SEPARATOR = Content(" │ ")
+HEADER_LINES = 2
+
+
+def row_key(row: Row) -> RowKey:
+    """Hashable identity of a row's text and styling."""
+    return tuple((cell.plain, tuple(cell.spans)) for cell in row)
+
+
+class ColumnWidths:
+    """Per-column widths kept current as rows are added and removed.
+
+    Each column keeps a histogram of its cell widths, so removing the widest
+    cell only rescans that column's distinct widths, never the rows.
+    """
+
+    def __init__(self, columns: int, max_width: int = 40) -> None:
+        self.max_width = max_width
+        self._counts: List[Counter] = [Counter() for _ in range(columns)]
+        self.widths: List[int] = [0] * columns
+
+    def _cell_widths(self, row: Row) -> List[int]:
+        return [
+            min(cell.cell_length, self.max_width) for cell in row[: len(self.widths)]
+        ]
+
+    def add(self, row: Row) -> bool:
+        """Count a row's cells; returns True if any column widened."""
+        changed = False
+        for column, width in enumerate(self._cell_widths(row)):
+            self._counts[column][width] += 1
+            if width > self.widths[column]:
+                self.widths[column] = width
+                changed = True
+        return changed
+
+    def remove(self, row: Row) -> bool:
+        """Forget a row's cells; returns True if any column narrowed."""
+        changed = False
+        for column, width in enumerate(self._cell_widths(row)):
+            counts = self._counts[column]
+            counts[width] -= 1
+            if counts[width] <= 0:
+                del counts[width]
+                if width == self.widths[column]:
+                    self.widths[column] = max(counts, default=0)
+                    changed = True
+        return changed
+
+
+class TableView(ScrollView, can_focus=False):
+    """A table drawn line by line, so only visible rows are ever rendered.
+
+    Column widths come from ColumnWidths and are updated per changed row.
+    Rendered rows are cached as strips; wide tables scroll horizontally.
+    """
+
+    DEFAULT_CSS = """
+    TableView {
+        width: 1fr;
+        height: auto;
+        overflow-x: auto;
+        overflow-y: hidden;
+        scrollbar-size-horizontal: 1;
+    }
+    """
+
+    def __init__(
+        self,
+        headers: Sequence[Content],
+        rows: Sequence[Row],
+        *,
+        keys: Optional[Sequence[Hashable]] = None,
+        max_column_width: int = 40,
+        cache_lines: int = 512,
+    ) -> None:
+        super().__init__()
+        self.max_column_width = max_column_width
+        self.cache_lines = cache_lines
+        self.headers: List[Content] = []
+        self.rows: List[Row] = []
+        self._keys: List[Hashable] = []
+        self._header_key: RowKey = ()
+        self._widths = ColumnWidths(0, max_column_width)
+        self._line_cache: "OrderedDict[int, Strip]" = OrderedDict()
+        self.set_rows(headers, rows, keys=keys)
+
+    @property
+    def column_widths(self) -> List[int]:
+        return self._widths.widths
+
+    def set_rows(
+        self,
+        headers: Sequence[Content],
+        rows: Sequence[Row],
+        *,
+        keys: Optional[Sequence[Hashable]] = None,
+    ) -> None:
+        """Replace the table contents, re-measuring only rows that changed.
+
+        Args:
+            headers: Header cells.
+            rows: Body rows.
+            keys: Cheap per-row identities, such as the rows' source text.
+                Computed from the cells when omitted.
+        """
+        header_key = row_key(headers)
+        row_keys: List[Hashable] = (
+            list(keys) if keys is not None else [row_key(row) for row in rows]
+        )
+        if header_key != self._header_key:
+            self.headers = list(headers)
+            self._header_key = header_key
+            self._widths = ColumnWidths(len(headers), self.max_column_width)
+            self._widths.add(headers)
+            for row in rows:
+                self._widths.add(row)
+            self.rows, self._keys = list(rows), row_keys
+            self._line_cache.clear()
+            self._resize()
+            return
+
+        old_keys = self._keys
+        prefix = 0
+        limit = min(len(old_keys), len(row_keys))
+        while prefix < limit and old_keys[prefix] == row_keys[prefix]:
+            prefix += 1
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and old_keys[-1 - suffix] == row_keys[-1 - suffix]:
+            suffix += 1
+
+        widths_changed = False
+        for row in self.rows[prefix : len(self.rows) - suffix]:
+            widths_changed |= self._widths.remove(row)
+        for row in rows[prefix : len(rows) - suffix]:
+            widths_changed |= self._widths.add(row)
+
+        if widths_changed:
+            self._line_cache.clear()
+        else:
+            moved = len(rows) != len(self.rows)
+            first = HEADER_LINES + prefix
+            last = HEADER_LINES + (len(rows) if moved else len(rows) - suffix)
+            for line in [line for line in self._line_cache if first <= line < last]:
+                del self._line_cache[line]
+        self.rows, self._keys = list(rows), row_keys
+        self._resize()
+
+    def _resize(self) -> None:
+        widths = self._widths.widths
+        total = sum(widths) + SEPARATOR.cell_length * max(len(widths) - 1, 0)
+        self.virtual_size = Size(total, len(self.rows) + HEADER_LINES)
+        self.refresh(layout=True)
+
+    def _format_row(self, row: Row, bold: bool = False) -> Content:
+        cells = []
+        for column, width in enumerate(self._widths.widths):
+            cell = row[column] if column < len(row) else Content("")
+            cell = cell.truncate(width, ellipsis=True, pad=True)
+            cells.append(cell.stylize("bold") if bold else cell)
+        return SEPARATOR.join(cells)
+
+    def _rule(self) -> Content:
+        return Content("─┼─").join(Content("─" * width) for width in self.column_widths)
+
+    def _full_line(self, line: int) -> Strip:
+        strip = self._line_cache.get(line)
+        if strip is not None:
+            self._line_cache.move_to_end(line)
+            return strip
+        if line == 0:
+            content = self._format_row(self.headers, bold=True)
+        elif line == 1:
+            content = self._rule()
+        else:
+            content = self._format_row(self.rows[line - HEADER_LINES])
+        strip = Strip(content.render_segments(Style.from_rich_style(self.rich_style)))
+        self._line_cache[line] = strip
+        if len(self._line_cache) > self.cache_lines:
+            self._line_cache.popitem(last=False)
+        return strip
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        line = y + scroll_y
+        width = self.size.width
+        if line >= len(self.rows) + HEADER_LINES:
+            return Strip.blank(width, self.rich_style)
+        strip = self._full_line(line)
+        return strip.crop_extend(scroll_x, scroll_x + width, self.rich_style)
+
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._line_cache.clear()
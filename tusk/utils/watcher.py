@@ -0,0 +1,147 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Return libc if it exposes inotify, otherwise None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    library = ctypes.util.find_library("c")
+    if not library:
+        return None
+    try:
+        libc = ctypes.CDLL(library, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """Reports changes to a single file made by other programs.
+
+    Uses inotify on the file's directory when available, so atomic
+    rename-over writes (git, sync clients, formatters) are seen too, and
+    falls back to polling size and mtime. Only metadata is watched; callers
+    decide whether content really changed.
+    """
+
+    def __init__(
+        self,
+        file_path: Optional[Path],
+        on_change: Callable[[], None],
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.file_path = file_path
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._libc = _load_inotify()
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._libc else "poll"
+
+    def start(self) -> None:
+        if self._thread or not self.file_path:
+            return
+        self._stop.clear()
+        target = self._run_inotify if self._libc else self._run_poll
+        self._thread = threading.Thread(target=target, name="tusk-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def set_path(self, file_path: Path) -> None:
+        """Watch a different file, restarting the watcher thread if running."""
+        running = self._thread is not None
+        self.stop()
+        self.file_path = file_path
+        if running:
+            self.start()
+
+    def _stat(self) -> Optional[tuple[int, int]]:
+        if self.file_path is None:
+            return None
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _run_poll(self) -> None:
+        last = self._stat()
+        while not self._stop.wait(self.poll_interval):
+            current = self._stat()
+            if current != last:
+                last = current
+                self.on_change()
+
+    def _run_inotify(self) -> None:
+        libc = self._libc
+        path = self.file_path
+        if path is None:
+            return
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            self._run_poll()
+            return
+        try:
+            directory = os.fsencode(path.parent)
+            if libc.inotify_add_watch(fd, directory, WATCH_MASK) < 0:
+                self._run_poll()
+                return
+            name = os.fsencode(path.name)
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                if name in self._event_names(data):
+                    self.on_change()
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _event_names(data: bytes) -> set[bytes]:
+        names: set[bytes] = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            names.add(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+        return names